@@ -25,6 +25,12 @@ async def on_ready():
     await bot.tree.sync(guild=guild)
 
     print(f"✅ Cleared all guild-specific commands from guild {GUILD_ID}")
+
+    # The bot skips syncing while its saved command hash matches; drop it so the next start re-registers
+    try:
+        os.remove(os.getenv("SYNC_HASH_FILE", ".last_sync_hash"))
+    except OSError:
+        pass
     print("The production bot should now only show global commands (no duplicates)")
 
     await bot.close()
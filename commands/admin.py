@@ -1,19 +1,188 @@
 """
 Admin commands for XP Bot - channel management and configuration
 """
+import asyncio
 import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.validation import validate_xp_amount, validate_daily_cap
+from utils.xp import get_level_and_progress, format_progress
+from utils.permissions import has_any_role_id, admin_only
+from utils.cooldown import fixed_cooldown
+from utils.users import get_or_fetch_user
 from ui.views import XPSettingsView
+from ui.character_view import DEFAULT_CHARACTER_IMAGE
 
 logger = logging.getLogger('xp-bot')
 
+# Guilds with a !sync in progress, so repeated invocations don't start parallel syncs
+_syncing_guilds = set()
+
+# Strong references to fire-and-forget notification tasks so they aren't garbage collected mid-send
+_background_tasks = set()
+
+
+# guild_id -> Webhook for the XP request channel, so notifications skip the bot's channel rate-limit bucket
+_webhook_cache = {}
+
+
+def _on_background_task_done(task: asyncio.Task):
+    """Release the task and log any exception it raised, since nothing awaits it"""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background notification task failed: {task.exception()}", exc_info=task.exception())
+
+
+def _run_in_background(coro):
+    """Schedule a coroutine without awaiting it"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
+
+
+# Static parts of the !xpsettings overview embed
+_EMBED_TITLE = "XP Bot Settings Overview"
+_RP_FIELD_NAME = "RP Settings"
+_RP_FIELD_FORMAT = "Channels: %s\nChars per XP: %d\nDaily RP Cap: %d"
+_SURVIVAL_FIELD_NAME = "Prized Species Settings"
+_SURVIVAL_FIELD_FORMAT = "Monitor Channels: %s"
+
+
+def _render_settings_embed(config) -> discord.Embed:
+    """Build the !xpsettings overview embed"""
+    rp_channels = ", ".join(f"<#{cid}>" for cid in config.get("rp_channels", [])) or "None"
+    survival_channels = ", ".join(f"<#{cid}>" for cid in config.get("survival_channels", [])) or "None (monitors all channels)"
+
+    embed = discord.Embed(title=_EMBED_TITLE)
+    embed.add_field(
+        name=_RP_FIELD_NAME,
+        value=_RP_FIELD_FORMAT % (rp_channels, config['char_per_rp'], config['daily_rp_cap']),
+        inline=False
+    )
+    embed.add_field(name=_SURVIVAL_FIELD_NAME, value=_SURVIVAL_FIELD_FORMAT % survival_channels, inline=False)
+    return embed
+
+
+# Field names of the XP grant notification embed; only values change per grant
+_GRANT_PLAYER_FIELD = "**Player**"
+_GRANT_LEVEL_FIELD = "**Level**"
+_GRANT_TOTAL_FIELD = "**New Total XP**"
+_GRANT_AMOUNT_FIELDS = ("**Amount Granted**", "**Amount Removed**")
+_GRANT_PROGRESS_FIELD = "**Current Level Progress**"
+_GRANT_REASON_FIELD = "**Reason**"
+
+
+def _build_grant_embed(char_name, user_id, amount, new_level, new_xp, progress, required,
+                       memo, image_url, granter_name) -> discord.Embed:
+    """Build the XP grant notification embed from a single payload dict"""
+    fields = [
+        {"name": _GRANT_PLAYER_FIELD, "value": f"<@{user_id}>", "inline": False},
+        {"name": _GRANT_LEVEL_FIELD, "value": str(new_level), "inline": True},
+        {"name": _GRANT_TOTAL_FIELD, "value": f"{new_xp:,}", "inline": True},
+        {"name": _GRANT_AMOUNT_FIELDS[amount < 0], "value": f"{abs(amount):,} XP", "inline": False},
+    ]
+    if progress is not None:
+        fields.append({"name": _GRANT_PROGRESS_FIELD, "value": format_progress(progress, required), "inline": False})
+    if memo:
+        fields.append({"name": _GRANT_REASON_FIELD, "value": memo, "inline": False})
+
+    color = discord.Color.green() if amount >= 0 else discord.Color.orange()
+    return discord.Embed.from_dict({
+        "type": "rich",
+        "title": f"XP Granted - {char_name}",
+        "color": color.value,
+        "timestamp": discord.utils.utcnow().isoformat(),
+        "fields": fields,
+        "thumbnail": {"url": image_url},
+        "footer": {"text": f"Granted by {granter_name}"},
+    })
+
+
+def _build_levelup_embed(char_name, user_id, old_level, new_level, new_xp, sheet_url, image_url) -> discord.Embed:
+    """Build the level-up embed posted to the log channel"""
+    fields = [
+        {"name": _GRANT_PLAYER_FIELD, "value": f"<@{user_id}>", "inline": False},
+        {"name": "**Previous Level**", "value": str(old_level), "inline": True},
+        {"name": "**New Level**", "value": str(new_level), "inline": True},
+        {"name": "**Total XP**", "value": f"{new_xp:,}", "inline": False},
+    ]
+    if sheet_url:
+        fields.append({"name": "**Character Sheet**", "value": f"[Update Your Sheet]({sheet_url})", "inline": False})
+
+    return discord.Embed.from_dict({
+        "type": "rich",
+        "title": f"🎉 Level Up! - {char_name}",
+        "description": f"**{char_name}** has reached **Level {new_level}**!",
+        "color": discord.Color.gold().value,
+        "timestamp": discord.utils.utcnow().isoformat(),
+        "fields": fields,
+        "thumbnail": {"url": image_url},
+        "footer": {"text": "Remember to update your character sheet!"},
+    })
+
+
+def _build_levelup_dm_embed(char_name, user_id, old_level, new_level, new_xp, memo, sheet_url,
+                            image_url, granter_name) -> discord.Embed:
+    """Build the level-up embed DMed to the character owner"""
+    fields = [
+        {"name": _GRANT_PLAYER_FIELD, "value": f"<@{user_id}>", "inline": False},
+        {"name": "**Old Level**", "value": str(old_level), "inline": True},
+        {"name": "**New Level**", "value": str(new_level), "inline": True},
+        {"name": _GRANT_TOTAL_FIELD, "value": f"{new_xp:,}", "inline": False},
+    ]
+    if memo:
+        fields.append({"name": _GRANT_REASON_FIELD, "value": memo, "inline": False})
+    if sheet_url:
+        action = f"Please update your [character sheet]({sheet_url}) to reflect your new level!"
+    else:
+        action = "Please update your character sheet to reflect your new level!"
+    fields.append({"name": "**Action Required**", "value": action, "inline": False})
+
+    return discord.Embed.from_dict({
+        "type": "rich",
+        "title": f"🎉 Level Up! - {char_name}",
+        "description": f"**{char_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
+        "color": discord.Color.gold().value,
+        "timestamp": discord.utils.utcnow().isoformat(),
+        "fields": fields,
+        "thumbnail": {"url": image_url},
+        "footer": {"text": f"Granted by {granter_name}"},
+    })
+
 
 def setup_admin_commands(bot, db, guild_id):
     """Register admin commands"""
 
+    async def get_request_destination():
+        """Get the XP request channel's webhook, falling back to the channel itself"""
+        webhook_url = await db.get_xp_request_webhook_url(guild_id)
+        if webhook_url:
+            webhook = _webhook_cache.get(guild_id)
+            if webhook is None or webhook.url != webhook_url:
+                webhook = discord.Webhook.from_url(webhook_url, client=bot)
+                _webhook_cache[guild_id] = webhook
+            return webhook
+
+        request_channel_id = await db.get_xp_request_channel(guild_id)
+        return bot.get_channel(request_channel_id) if request_channel_id else None
+
+    async def send_to_request_destination(destination, embed: discord.Embed):
+        """Send an embed to the request destination, falling back to the channel if its webhook was deleted"""
+        try:
+            await destination.send(embed=embed)
+        except discord.NotFound:
+            if not isinstance(destination, discord.Webhook):
+                raise
+            # The webhook was removed in Discord; stop using it and post as the bot
+            logger.warning(f"XP request webhook for guild {guild_id} no longer exists, posting to the channel instead")
+            await db.clear_xp_request_webhook_url(guild_id)
+            _webhook_cache.pop(guild_id, None)
+            request_channel_id = await db.get_xp_request_channel(guild_id)
+            request_channel = bot.get_channel(request_channel_id) if request_channel_id else None
+            if request_channel:
+                await request_channel.send(embed=embed)
+
     async def has_character_creation_permission(interaction: discord.Interaction) -> bool:
         """Check if user has permission to create characters (same for granting XP)"""
         # Admins always have permission
@@ -21,15 +190,14 @@ def setup_admin_commands(bot, db, guild_id):
             return True
 
         # Check if user has any of the allowed roles
-        allowed_role_ids = await db.get_character_creation_roles(guild_id)
+        allowed_role_ids = await db.get_character_creation_role_ids(guild_id)
 
         # If no roles configured, allow everyone
         if not allowed_role_ids:
             return True
 
         # Check if user has any allowed role
-        user_role_ids = [role.id for role in interaction.user.roles]
-        return any(role_id in allowed_role_ids for role_id in user_role_ids)
+        return has_any_role_id(interaction.user, allowed_role_ids)
 
     async def all_characters_autocomplete(interaction: discord.Interaction, current: str):
         """Autocomplete function for all character names (admin command)"""
@@ -51,10 +219,12 @@ def setup_admin_commands(bot, db, guild_id):
         memo="Reason for granting XP (optional)"
     )
     @app_commands.autocomplete(character_name=all_characters_autocomplete)
-    @app_commands.checks.cooldown(10, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(10, 60.0)
     async def xp_grant(interaction: discord.Interaction, character_name: str, amount: int, memo: str = None):
         # Check if user has permission to grant XP (same as character creation)
-        if not await has_character_creation_permission(interaction):
+        # Most grants come from admins, so skip the role-lookup coroutine entirely for them
+        is_admin = interaction.user.guild_permissions.administrator
+        if not is_admin and not await has_character_creation_permission(interaction):
             await interaction.response.send_message(
                 "❌ You don't have permission to grant XP. Contact an administrator.",
                 ephemeral=True
@@ -68,289 +238,85 @@ def setup_admin_commands(bot, db, guild_id):
             logger.debug(f"Invalid XP amount {amount} from admin {interaction.user.id}")
             return
 
-        # Find character across all users
-        result = await db.find_character_by_name_any_user(character_name)
+        # Acknowledge now; the lookups, writes and notifications below can exceed Discord's 3s window.
+        # Failures after this point are answered with a followup (see handlers/errors.py)
+        await interaction.response.defer(ephemeral=True)
 
+        # Find character across all users (autocomplete supplies the exact name)
+        result = await db.find_character_by_name_any_user(character_name)
         if not result:
-            await interaction.response.send_message("❌ Character not found.", ephemeral=True)
+            await interaction.followup.send("❌ Character not found.", ephemeral=True)
             return
 
         user_id, char_data = result
         char_name = char_data['name']
         character_id = char_data['id']
 
-        # Award XP (bypassing daily caps since this is admin grant)
-        xp_result = await db.award_xp(user_id, char_name, amount)
+        # Award XP (bypassing daily caps since this is admin grant) and log it with the memo
+        xp_result = await db.grant_xp_with_memo(character_id, amount, interaction.user.id, memo)
 
-        # Log the XP grant with memo
-        await db.log_xp_grant(character_id, interaction.user.id, amount, memo)
-
-        # Get updated character info for notification
-        from utils.xp import get_level_and_progress
-        updated_char = await db.get_character(user_id, char_name)
-        new_xp = updated_char['xp']
+        # Updated character info for notification
+        updated_char = xp_result['character']
+        new_xp = xp_result['new_xp']
         new_level, progress, required = get_level_and_progress(new_xp)
 
         # Check if character leveled up
         leveled_up = xp_result['leveled_up']
         old_level = xp_result['old_level']
 
-        # Post notification to request channel if configured
-        request_channel_id = await db.get_xp_request_channel(guild_id)
-        if request_channel_id:
-            request_channel = bot.get_channel(request_channel_id)
-            if request_channel:
-                try:
-                    from ui.character_view import DEFAULT_CHARACTER_IMAGE
-                    notification_embed = discord.Embed(
-                        title=f"XP Granted - {char_name}",
-                        color=discord.Color.green() if amount >= 0 else discord.Color.orange(),
-                        timestamp=discord.utils.utcnow()
-                    )
-
-                    notification_embed.add_field(
-                        name="**Player**",
-                        value=f"<@{user_id}>",
-                        inline=False
-                    )
-
-                    notification_embed.add_field(
-                        name="**Level**",
-                        value=str(new_level),
-                        inline=True
-                    )
-
-                    notification_embed.add_field(
-                        name="**New Total XP**",
-                        value=f"{new_xp:,}",
-                        inline=True
-                    )
-
-                    action_word = "Granted" if amount >= 0 else "Removed"
-                    notification_embed.add_field(
-                        name=f"**Amount {action_word}**",
-                        value=f"{abs(amount):,} XP",
-                        inline=False
-                    )
-
-                    if progress is not None:
-                        percentage = int((progress / required) * 100)
-                        bar = int((progress / required) * 20)
-                        progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
-                        notification_embed.add_field(
-                            name="**Current Level Progress**",
-                            value=progress_text,
-                            inline=False
-                        )
-
-                    if memo:
-                        notification_embed.add_field(
-                            name="**Reason**",
-                            value=memo,
-                            inline=False
-                        )
-
-                    # Add character image
-                    image_url = updated_char.get("image_url") or DEFAULT_CHARACTER_IMAGE
-                    notification_embed.set_thumbnail(url=image_url)
-
-                    notification_embed.set_footer(text=f"Granted by {interaction.user.display_name}")
-
-                    await request_channel.send(embed=notification_embed)
-                except Exception as e:
-                    logger.error(f"Failed to post XP grant notification: {e}")
-
-        # Send DM to the character owner (always sent, in addition to level-up if applicable)
-        try:
-            character_owner = await interaction.client.fetch_user(user_id)
-
-            # Create DM embed matching the log channel format
-            from ui.character_view import DEFAULT_CHARACTER_IMAGE
-            dm_embed = discord.Embed(
-                title=f"XP Granted - {char_name}",
-                color=discord.Color.green() if amount >= 0 else discord.Color.orange(),
-                timestamp=discord.utils.utcnow()
-            )
-
-            dm_embed.add_field(
-                name="**Player**",
-                value=f"<@{user_id}>",
-                inline=False
-            )
-
-            dm_embed.add_field(
-                name="**Level**",
-                value=str(new_level),
-                inline=True
-            )
-
-            dm_embed.add_field(
-                name="**New Total XP**",
-                value=f"{new_xp:,}",
-                inline=True
-            )
-
-            action_text = "Granted" if amount >= 0 else "Removed"
-            dm_embed.add_field(
-                name=f"**Amount {action_text}**",
-                value=f"{abs(amount):,} XP",
-                inline=False
+        async def send_grant_notifications():
+            """Post grant and level-up notifications to the log channel and DM the owner"""
+            # Build every embed up front; nothing below depends on a send's result
+            image_url = updated_char.get("image_url") or DEFAULT_CHARACTER_IMAGE
+            grant_embed = _build_grant_embed(
+                char_name, user_id, amount, new_level, new_xp, progress, required,
+                memo, image_url, interaction.user.display_name
             )
-
-            if progress is not None:
-                percentage = int((progress / required) * 100)
-                bar = int((progress / required) * 20)
-                progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
-                dm_embed.add_field(
-                    name="**Current Level Progress**",
-                    value=progress_text,
-                    inline=False
+            levelup_embed = levelup_dm_embed = None
+            if leveled_up:
+                sheet_url = updated_char.get('character_sheet_url')
+                levelup_embed = _build_levelup_embed(
+                    char_name, user_id, old_level, new_level, new_xp, sheet_url, image_url
                 )
-
-            if memo:
-                dm_embed.add_field(
-                    name="**Reason**",
-                    value=memo,
-                    inline=False
+                levelup_dm_embed = _build_levelup_dm_embed(
+                    char_name, user_id, old_level, new_level, new_xp, memo, sheet_url,
+                    image_url, interaction.user.display_name
                 )
 
-            # Add character image
-            image_url = updated_char.get("image_url") or DEFAULT_CHARACTER_IMAGE
-            dm_embed.set_thumbnail(url=image_url)
-
-            dm_embed.set_footer(text=f"Granted by {interaction.user.display_name}")
-
-            await character_owner.send(embed=dm_embed)
-        except discord.Forbidden:
-            logger.warning(f"Could not send DM to user {user_id} - DMs may be disabled")
-        except Exception as e:
-            logger.warning(f"Could not send XP grant notification to user {user_id}: {e}")
-
-        # Send level-up notifications if character leveled up
-        if leveled_up:
-            # Send level-up notification to log channel
-            if request_channel_id:
-                request_channel = bot.get_channel(request_channel_id)
+            async def post_to_log_channel():
+                # Post to request channel if configured (via its webhook when available)
+                request_channel = await get_request_destination()
+                if not request_channel:
+                    return
+                try:
+                    await send_to_request_destination(request_channel, grant_embed)
+                except Exception as e:
+                    logger.error(f"Failed to post XP grant notification: {e}")
+                if not levelup_embed:
+                    return
+                # Re-resolve in case the grant post found the webhook gone
+                request_channel = await get_request_destination()
                 if request_channel:
                     try:
-                        from ui.character_view import DEFAULT_CHARACTER_IMAGE
-                        levelup_embed = discord.Embed(
-                            title=f"🎉 Level Up! - {char_name}",
-                            description=f"**{char_name}** has reached **Level {new_level}**!",
-                            color=discord.Color.gold(),
-                            timestamp=discord.utils.utcnow()
-                        )
-
-                        levelup_embed.add_field(
-                            name="**Player**",
-                            value=f"<@{user_id}>",
-                            inline=False
-                        )
-
-                        levelup_embed.add_field(
-                            name="**Previous Level**",
-                            value=str(old_level),
-                            inline=True
-                        )
-
-                        levelup_embed.add_field(
-                            name="**New Level**",
-                            value=str(new_level),
-                            inline=True
-                        )
-
-                        levelup_embed.add_field(
-                            name="**Total XP**",
-                            value=f"{new_xp:,}",
-                            inline=False
-                        )
-
-                        # Add character sheet link if available
-                        if updated_char.get('character_sheet_url'):
-                            levelup_embed.add_field(
-                                name="**Character Sheet**",
-                                value=f"[Update Your Sheet]({updated_char['character_sheet_url']})",
-                                inline=False
-                            )
-
-                        # Add character image
-                        image_url = updated_char.get("image_url") or DEFAULT_CHARACTER_IMAGE
-                        levelup_embed.set_thumbnail(url=image_url)
-
-                        levelup_embed.set_footer(text=f"Remember to update your character sheet!")
-
-                        await request_channel.send(embed=levelup_embed)
+                        await send_to_request_destination(request_channel, levelup_embed)
                     except Exception as e:
                         logger.error(f"Failed to post level-up notification: {e}")
 
-            # Send level-up DM
-            try:
-                character_owner = await interaction.client.fetch_user(user_id)
-
-                # Create rich embed for level-up DM
-                from ui.character_view import DEFAULT_CHARACTER_IMAGE
-                levelup_dm_embed = discord.Embed(
-                    title=f"🎉 Level Up! - {char_name}",
-                    description=f"**{char_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
-                    color=discord.Color.gold(),
-                    timestamp=discord.utils.utcnow()
-                )
-
-                levelup_dm_embed.add_field(
-                    name="**Player**",
-                    value=f"<@{user_id}>",
-                    inline=False
-                )
-
-                levelup_dm_embed.add_field(
-                    name="**Old Level**",
-                    value=str(old_level),
-                    inline=True
-                )
-
-                levelup_dm_embed.add_field(
-                    name="**New Level**",
-                    value=str(new_level),
-                    inline=True
-                )
-
-                levelup_dm_embed.add_field(
-                    name="**New Total XP**",
-                    value=f"{new_xp:,}",
-                    inline=False
-                )
+            async def dm_owner():
+                # DM the character owner (always sent, in addition to level-up if applicable)
+                try:
+                    character_owner = await get_or_fetch_user(interaction.client, user_id)
+                    await character_owner.send(embed=grant_embed)
+                    if levelup_dm_embed:
+                        await character_owner.send(embed=levelup_dm_embed)
+                except discord.Forbidden:
+                    logger.warning(f"Could not send DM to user {user_id} - DMs may be disabled")
+                except Exception as e:
+                    logger.warning(f"Could not send XP grant notification to user {user_id}: {e}")
 
-                if memo:
-                    levelup_dm_embed.add_field(
-                        name="**Reason**",
-                        value=memo,
-                        inline=False
-                    )
-
-                if updated_char.get('character_sheet_url'):
-                    levelup_dm_embed.add_field(
-                        name="**Action Required**",
-                        value=f"Please update your [character sheet]({updated_char['character_sheet_url']}) to reflect your new level!",
-                        inline=False
-                    )
-                else:
-                    levelup_dm_embed.add_field(
-                        name="**Action Required**",
-                        value="Please update your character sheet to reflect your new level!",
-                        inline=False
-                    )
-
-                # Add character image
-                image_url = updated_char.get("image_url") or DEFAULT_CHARACTER_IMAGE
-                levelup_dm_embed.set_thumbnail(url=image_url)
-
-                levelup_dm_embed.set_footer(text=f"Granted by {interaction.user.display_name}")
-
-                await character_owner.send(embed=levelup_dm_embed)
-            except discord.Forbidden:
-                logger.warning(f"Could not send level-up DM to user {user_id} - DMs may be disabled")
-            except Exception as e:
-                logger.warning(f"Could not send level-up DM to user {user_id}: {e}")
+            # The log channel and the DM are independent, so send to both at once
+            # (each destination still receives the grant before the level-up)
+            await asyncio.gather(post_to_log_channel(), dm_owner())
 
         action = "Granted" if amount >= 0 else "Removed"
         response = f"✅ {action} {abs(amount)} XP {'to' if amount >= 0 else 'from'} **{char_name}** (user ID: {user_id})."
@@ -359,76 +325,69 @@ def setup_admin_commands(bot, db, guild_id):
         if leveled_up:
             response += f"\n🎉 {char_name} leveled up from {old_level} to {new_level}!"
 
-        await interaction.response.send_message(response, ephemeral=True)
+        await interaction.followup.send(response, ephemeral=True)
+
+        # Notifications go out in the background so the reply isn't held up by cross-channel sends
+        _run_in_background(send_grant_notifications())
 
     @bot.tree.command(name="xp_purge", description="[Admin] Permanently delete a user and all their characters")
     @app_commands.describe(user="User to permanently delete from the database")
-    @app_commands.checks.cooldown(1, 300.0, key=lambda i: i.user.id)
+    @fixed_cooldown(1, 300.0)
+    @admin_only
     async def xp_purge(interaction: discord.Interaction, user: discord.User):
-        # Only administrators can purge users
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
-
         user_id = user.id
 
-        # Get character count before purging
-        characters = await db.list_characters(user_id, include_retired=True)
-        char_count = len(characters)
+        # Cascading deletes can be slow for users with many characters, so acknowledge first
+        await interaction.response.defer(ephemeral=True)
+
+        # Purge the user, getting back how many characters went with them
+        char_count = await db.purge_user(user_id)
 
         if char_count == 0:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"⚠️ User {user.mention} has no characters in the database.",
                 ephemeral=True
             )
             return
 
-        # Purge the user
-        purged = await db.purge_user(user_id)
-
-        if purged:
-            await interaction.response.send_message(
-                f"🗑️ **PURGED** user {user.mention} (ID: {user_id}) and **{char_count}** character(s) from the database.\n\n"
-                f"_This action was performed for data privacy compliance. All user data has been permanently deleted._",
-                ephemeral=True
-            )
-            logger.warning(f"Admin {interaction.user.id} purged user {user_id} and {char_count} characters")
-        else:
-            await interaction.response.send_message(
-                f"❌ User {user.mention} not found in the database.",
-                ephemeral=True
-            )
+        await interaction.followup.send(
+            f"🗑️ **PURGED** user {user.mention} (ID: {user_id}) and **{char_count}** character(s) from the database.\n\n"
+            f"_This action was performed for data privacy compliance. All user data has been permanently deleted._",
+            ephemeral=True
+        )
+        logger.warning(f"Admin {interaction.user.id} purged user {user_id} and {char_count} characters")
 
     @bot.tree.command(name="xp_add_rp_channel")
     @app_commands.describe(channel="Channel to enable for RP XP tracking")
-    @app_commands.checks.cooldown(5, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(5, 60.0)
+    @admin_only
     async def xp_add_rp_channel(interaction: discord.Interaction, channel: discord.TextChannel):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
+        # The write only reports a change when the channel wasn't already tracked
+        rp_channel_ids, _ = await db.get_tracked_channels(guild_id)
+        if channel.id in rp_channel_ids or not await db.add_rp_channel(guild_id, channel.id):
+            await interaction.response.send_message(f"ℹ️ {channel.mention} is already tracked for RP XP.", ephemeral=True)
             return
 
-        await db.add_rp_channel(guild_id, channel.id)
         await interaction.response.send_message(f"✅ Channel {channel.mention} added for RP XP tracking.", ephemeral=True)
 
     @bot.tree.command(name="xp_remove_rp_channel")
     @app_commands.describe(channel="Channel to disable RP tracking")
-    @app_commands.checks.cooldown(5, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(5, 60.0)
+    @admin_only
     async def xp_remove_rp_channel(interaction: discord.Interaction, channel: discord.TextChannel):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
+        # The write only reports a change when the channel was actually tracked
+        rp_channel_ids, _ = await db.get_tracked_channels(guild_id)
+        if channel.id not in rp_channel_ids or not await db.remove_rp_channel(guild_id, channel.id):
+            await interaction.response.send_message(f"ℹ️ {channel.mention} is not tracked for RP XP.", ephemeral=True)
             return
 
-        await db.remove_rp_channel(guild_id, channel.id)
         await interaction.response.send_message(f"🚫 RP XP tracking disabled in {channel.mention}.", ephemeral=True)
 
     @bot.tree.command(name="xp_set_cap")
     @app_commands.describe(amount="New daily XP cap")
-    @app_commands.checks.cooldown(3, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(3, 60.0)
+    @admin_only
     async def xp_set_cap(interaction: discord.Interaction, amount: int):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
-
         # Validate daily cap
         is_valid, error_msg = validate_daily_cap(amount)
         if not is_valid:
@@ -441,12 +400,9 @@ def setup_admin_commands(bot, db, guild_id):
 
     @bot.tree.command(name="xp_add_admin_role", description="Add a role that can create characters and grant XP")
     @app_commands.describe(role="Role to grant admin permissions (character creation and XP granting)")
-    @app_commands.checks.cooldown(5, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(5, 60.0)
+    @admin_only
     async def xp_add_admin_role(interaction: discord.Interaction, role: discord.Role):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
-
         await db.add_character_creation_role(guild_id, role.id)
         await interaction.response.send_message(
             f"✅ Role {role.mention} can now create characters and grant XP.",
@@ -455,12 +411,9 @@ def setup_admin_commands(bot, db, guild_id):
 
     @bot.tree.command(name="xp_remove_admin_role", description="Remove XP admin permissions from a role")
     @app_commands.describe(role="Role to remove admin permissions from")
-    @app_commands.checks.cooldown(5, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(5, 60.0)
+    @admin_only
     async def xp_remove_admin_role(interaction: discord.Interaction, role: discord.Role):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
-
         await db.remove_character_creation_role(guild_id, role.id)
         await interaction.response.send_message(
             f"🚫 Role {role.mention} can no longer create characters or grant XP.",
@@ -468,12 +421,9 @@ def setup_admin_commands(bot, db, guild_id):
         )
 
     @bot.tree.command(name="xp_list_admin_roles", description="List roles with XP admin permissions")
-    @app_commands.checks.cooldown(3, 30.0, key=lambda i: i.user.id)
+    @fixed_cooldown(3, 30.0)
+    @admin_only
     async def xp_list_admin_roles(interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
-
         role_ids = await db.get_character_creation_roles(guild_id)
 
         if not role_ids:
@@ -483,42 +433,50 @@ def setup_admin_commands(bot, db, guild_id):
             )
             return
 
-        role_mentions = [f"<@&{rid}>" for rid in role_ids]
-        await interaction.response.send_message(
-            f"**Roles with XP admin permissions:**\n" + "\n".join(role_mentions),
-            ephemeral=True
-        )
+        message = "**Roles with XP admin permissions:**\n" + "\n".join(f"<@&{rid}>" for rid in role_ids)
+        await interaction.response.send_message(message, ephemeral=True)
 
     @bot.tree.command(name="xp_set_log_channel", description="Set channel for XP logging (requests, grants, character creation)")
     @app_commands.describe(channel="Channel where XP activity will be logged")
-    @app_commands.checks.cooldown(3, 60.0, key=lambda i: i.user.id)
+    @fixed_cooldown(3, 60.0)
+    @admin_only
     async def xp_set_log_channel(interaction: discord.Interaction, channel: discord.TextChannel):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("❌ Admin only.", ephemeral=True)
-            return
+        # Acknowledge now; the webhook lookup and creation below are HTTP calls
+        await interaction.response.defer(ephemeral=True)
 
-        await db.set_xp_request_channel(guild_id, channel.id)
-        await interaction.response.send_message(
-            f"✅ XP activity will now be logged in {channel.mention}.",
+        # /xp_grant notifications post through a webhook so they don't share the bot's rate-limit
+        # bucket; everything else logged here posts as the bot. Reuse a webhook this bot already
+        # created there, since Discord caps channels at 15 webhooks
+        webhook_url = None
+        try:
+            webhook = discord.utils.find(
+                lambda w: w.user is not None and w.user.id == bot.user.id and w.token,
+                await channel.webhooks()
+            )
+            if webhook is None:
+                webhook = await channel.create_webhook(name="XP Bot")
+            webhook_url = webhook.url
+        except discord.HTTPException as e:
+            logger.warning(f"Could not create webhook in channel {channel.id}, posting as the bot instead: {e}")
+
+        await db.set_xp_request_channel(guild_id, channel.id, webhook_url)
+        _webhook_cache.pop(guild_id, None)
+        await interaction.followup.send(
+            f"✅ XP activity will now be logged in {channel.mention}." + (
+                " XP grant notifications will be posted through a webhook." if webhook_url else ""
+            ),
             ephemeral=True
         )
 
     @bot.command(name="xpsettings")
+    @commands.has_permissions(administrator=True)
     async def xpsettings(ctx):
         """Legacy prefix command for XP settings UI"""
-        if not ctx.author.guild_permissions.administrator:
-            await ctx.send("❌ Admin only.")
-            return
-
+        # Config is served from the Database cache, which every config write invalidates
         config = await db.get_config(guild_id)
-        rp_channels = ", ".join(f"<#{cid}>" for cid in config.get("rp_channels", [])) or "None"
-        survival_channels = ", ".join(f"<#{cid}>" for cid in config.get("survival_channels", [])) or "None (monitors all channels)"
-
-        embed = discord.Embed(title="XP Bot Settings Overview")
-        embed.add_field(name="RP Settings", value=f"Channels: {rp_channels}\nChars per XP: {config['char_per_rp']}\nDaily RP Cap: {config['daily_rp_cap']}", inline=False)
-        embed.add_field(name="Prized Species Settings", value=f"Monitor Channels: {survival_channels}", inline=False)
-
-        await ctx.send(embed=embed, view=XPSettingsView(bot, db, guild_id))
+        embed = _render_settings_embed(config)
+        view = XPSettingsView(bot, db, guild_id)
+        view.message = await ctx.send(embed=embed, view=view)
 
     @bot.command(name="sync")
     async def sync(ctx):
@@ -528,5 +486,27 @@ def setup_admin_commands(bot, db, guild_id):
             return
 
         guild = ctx.guild
-        synced = await bot.tree.sync(guild=guild)
-        await ctx.send(f"✅ Synced {len(synced)} commands to guild `{guild.name}` ({guild.id})")
+        if guild.id in _syncing_guilds:
+            await ctx.send("⏳ A sync for this server is already running.")
+            return
+
+        _syncing_guilds.add(guild.id)
+        try:
+            msg = await ctx.send("⏳ Syncing...")
+        except discord.HTTPException:
+            _syncing_guilds.discard(guild.id)
+            raise
+
+        async def do_sync():
+            try:
+                # tree.sync issues a single bulk overwrite (PUT) for every command in the guild
+                synced = await bot.tree.sync(guild=guild)
+                await msg.edit(content=f"✅ Synced {len(synced)} commands to guild `{guild.name}` ({guild.id})")
+            except discord.HTTPException as e:
+                logger.error(f"Failed to sync commands to guild {guild.id}: {e}")
+                await msg.edit(content=f"❌ Sync failed: {e}")
+            finally:
+                _syncing_guilds.discard(guild.id)
+
+        # Reply right away and let the slow sync finish in the background
+        _run_in_background(do_sync())
@@ -1,23 +1,47 @@
 """
 Character management commands for XP Bot
 """
+import asyncio
 import logging
-import difflib
 import discord
 from discord import app_commands
 from utils.xp import get_level_and_progress
+from utils.search import closest_name
+from utils.permissions import has_any_role_id
+from utils.users import get_or_fetch_user
+from utils.cooldown import user_cooldown_key
 from utils.validation import validate_character_name, validate_image_url, validate_character_sheet_url, validate_xp_amount
 from utils.exceptions import (
     DatabaseError,
     CharacterNotFoundError,
     DuplicateCharacterError
 )
-from ui.character_view import CharacterNavigationView
+from ui.character_view import CharacterNavigationView, DEFAULT_CHARACTER_IMAGE
 from ui.xp_request_view import XPRequestView
 
 logger = logging.getLogger('xp-bot')
 
 
+def _build_request_embed(char_name, user_id, xp_amount, amount, memo, image_url, requester_name) -> discord.Embed:
+    """Build the XP request embed posted to the request channel from a single payload dict"""
+    level, _, _ = get_level_and_progress(xp_amount)
+    return discord.Embed.from_dict({
+        "type": "rich",
+        "title": f"XP Request - {char_name}",
+        "color": discord.Color.blue().value,
+        "timestamp": discord.utils.utcnow().isoformat(),
+        "fields": [
+            {"name": "**Player**", "value": f"<@{user_id}>", "inline": False},
+            {"name": "**Current Level**", "value": str(level), "inline": True},
+            {"name": "**Current Total XP**", "value": f"{xp_amount:,}", "inline": True},
+            {"name": "**Requested Amount**", "value": f"{amount:,} XP", "inline": False},
+            {"name": "**Reason**", "value": memo, "inline": False},
+        ],
+        "thumbnail": {"url": image_url},
+        "footer": {"text": f"Request by {requester_name}"},
+    })
+
+
 def setup_character_commands(bot, db, guild_id):
     """Register character management commands"""
 
@@ -28,35 +52,25 @@ def setup_character_commands(bot, db, guild_id):
             return True
 
         # Check if user has any of the allowed roles
-        allowed_role_ids = await db.get_character_creation_roles(guild_id)
+        allowed_role_ids = await db.get_character_creation_role_ids(guild_id)
 
         # If no roles configured, allow everyone
         if not allowed_role_ids:
             return True
 
         # Check if user has any allowed role
-        user_role_ids = [role.id for role in interaction.user.roles]
-        return any(role_id in allowed_role_ids for role_id in user_role_ids)
+        return has_any_role_id(interaction.user, allowed_role_ids)
 
     async def character_autocomplete(interaction: discord.Interaction, current: str):
         """Autocomplete function for user's character names"""
         try:
-            user_id = interaction.user.id
-            await db.ensure_user(user_id)
-            characters = await db.list_characters(user_id)
-
-            # Filter characters based on what user is typing
-            char_names = [char['name'] for char in characters]
-            if current:
-                # Case-insensitive filtering
-                filtered = [name for name in char_names if current.lower() in name.lower()]
-            else:
-                filtered = char_names
+            # Names are cached per user, so typing doesn't cost a query per keystroke
+            name_index = await db.get_character_name_index(interaction.user.id)
 
-            # Return up to 25 choices (Discord limit)
+            # Case-insensitive filtering, prefix matches first, up to 25 choices (Discord limit)
             return [
                 app_commands.Choice(name=name, value=name)
-                for name in filtered[:25]
+                for name in name_index.search(current)
             ]
         except Exception as e:
             logger.error(f"Error in character autocomplete: {e}")
@@ -64,7 +78,7 @@ def setup_character_commands(bot, db, guild_id):
 
     @bot.tree.command(name="xp", description="View XP, level, and progress for characters")
     @app_commands.describe(user="User whose characters to view (defaults to yourself)")
-    @app_commands.checks.cooldown(3, 10.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(3, 10.0, key=user_cooldown_key)
     async def xp(interaction: discord.Interaction, user: discord.User = None):
         # Default to viewing own characters
         if user is None:
@@ -72,9 +86,12 @@ def setup_character_commands(bot, db, guild_id):
 
         target_user_id = user.id
         viewer_user_id = interaction.user.id
-        await db.ensure_user(target_user_id)
 
-        characters = await db.list_characters(target_user_id)
+        # One query creates the user if needed and returns their characters with the active one marked
+        characters, active_index = await db.ensure_user_and_list_characters(target_user_id)
+        if target_user_id != viewer_user_id:
+            active_index = None
+
         if not characters:
             if target_user_id == viewer_user_id:
                 await interaction.response.send_message("❌ You don't have any characters yet.", ephemeral=True)
@@ -82,20 +99,11 @@ def setup_character_commands(bot, db, guild_id):
                 await interaction.response.send_message(f"❌ {user.display_name} doesn't have any characters yet.", ephemeral=True)
             return
 
-        # Get active character name (only if viewing own characters)
-        active_char_name = None
-        if target_user_id == viewer_user_id:
-            active_char = await db.get_active_character(target_user_id)
-            active_char_name = active_char['name'] if active_char else None
+        # Active character is only shown when viewing own characters
+        active_char_name = characters[active_index]['name'] if active_index is not None else None
 
         # Start at first character (or active if viewing own)
-        current_index = 0
-        if target_user_id == viewer_user_id and active_char_name:
-            # Find active character index
-            for i, char in enumerate(characters):
-                if char['name'] == active_char_name:
-                    current_index = i
-                    break
+        current_index = active_index if active_index is not None else 0
 
         # Create navigation view
         view = CharacterNavigationView(target_user_id, viewer_user_id, characters, active_char_name, db, current_index)
@@ -111,7 +119,7 @@ def setup_character_commands(bot, db, guild_id):
         image_url="Optional image URL",
         starting_xp="Starting XP amount (defaults to 0)"
     )
-    @app_commands.checks.cooldown(3, 60.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(3, 60.0, key=user_cooldown_key)
     async def xp_create(interaction: discord.Interaction, user: discord.User = None, char_name: str = "", sheet_url: str = "", image_url: str = None, starting_xp: int = 0):
         # Check required fields
         if not char_name or not char_name.strip():
@@ -173,24 +181,13 @@ def setup_character_commands(bot, db, guild_id):
             logger.debug(f"Invalid starting XP {starting_xp} from user {interaction.user.id}: {error_msg}")
             return
 
-        await db.ensure_user(target_user_id)
-
-        # Check if character already exists
         char_name = char_name.strip()  # Use trimmed version
-        existing = await db.get_character(target_user_id, char_name)
-        if existing:
-            if target_user_id == interaction.user.id:
-                await interaction.response.send_message(f"❌ Character '{char_name}' already exists.", ephemeral=True)
-            else:
-                await interaction.response.send_message(f"❌ Character '{char_name}' already exists for {user.display_name}.", ephemeral=True)
-            return
 
-        # Create character
+        # Create character; the insert itself rejects duplicate names
         try:
             await db.create_character(target_user_id, char_name, image_url, sheet_url, starting_xp)
 
             # Calculate starting level
-            from utils.xp import get_level_and_progress
             starting_level, _, _ = get_level_and_progress(starting_xp)
 
             # Respond to user
@@ -201,7 +198,7 @@ def setup_character_commands(bot, db, guild_id):
 
             # Send DM to the character owner
             try:
-                character_owner = await interaction.client.fetch_user(target_user_id)
+                character_owner = await get_or_fetch_user(interaction.client, target_user_id)
                 dm_message = (
                     f"✅ Your character **{char_name}** has been created!\n"
                     f"Starting XP: {starting_xp:,}\n"
@@ -225,7 +222,6 @@ def setup_character_commands(bot, db, guild_id):
                 request_channel = bot.get_channel(request_channel_id)
                 if request_channel:
                     try:
-                        from ui.character_view import DEFAULT_CHARACTER_IMAGE
                         notification_embed = discord.Embed(
                             title=f"Character Created - {char_name}",
                             color=discord.Color.blue(),
@@ -272,7 +268,10 @@ def setup_character_commands(bot, db, guild_id):
                         logger.error(f"Failed to post character creation notification: {e}")
 
         except DuplicateCharacterError:
-            await interaction.response.send_message(f"❌ Character '{char_name}' already exists.", ephemeral=True)
+            if target_user_id == interaction.user.id:
+                await interaction.response.send_message(f"❌ Character '{char_name}' already exists.", ephemeral=True)
+            else:
+                await interaction.response.send_message(f"❌ Character '{char_name}' already exists for {user.display_name}.", ephemeral=True)
         except DatabaseError as e:
             logger.error(f"Database error creating character '{char_name}' for user {target_user_id}: {e}")
             await interaction.response.send_message(
@@ -291,11 +290,9 @@ def setup_character_commands(bot, db, guild_id):
         try:
             # Check if user has character creation permission (same as granting XP)
             if not interaction.user.guild_permissions.administrator:
-                allowed_role_ids = await db.get_character_creation_roles(guild_id)
-                if allowed_role_ids:
-                    user_role_ids = [role.id for role in interaction.user.roles]
-                    if not any(role_id in allowed_role_ids for role_id in user_role_ids):
-                        return []
+                allowed_role_ids = await db.get_character_creation_role_ids(guild_id)
+                if allowed_role_ids and not has_any_role_id(interaction.user, allowed_role_ids):
+                    return []
 
             # Search all characters across all users
             char_names = await db.search_all_character_names(current, limit=25)
@@ -310,15 +307,14 @@ def setup_character_commands(bot, db, guild_id):
     @bot.tree.command(name="xp_retire", description="[Admin] Retire a character (soft delete)")
     @app_commands.describe(character_name="Character name to retire")
     @app_commands.autocomplete(character_name=all_characters_autocomplete_for_retire)
-    @app_commands.checks.cooldown(2, 60.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(2, 60.0, key=user_cooldown_key)
     async def xp_retire(interaction: discord.Interaction, character_name: str):
         # Check if user has permission to retire characters (admin or character creation role)
         has_permission = interaction.user.guild_permissions.administrator
         if not has_permission:
-            allowed_role_ids = await db.get_character_creation_roles(guild_id)
+            allowed_role_ids = await db.get_character_creation_role_ids(guild_id)
             if allowed_role_ids:
-                user_role_ids = [role.id for role in interaction.user.roles]
-                has_permission = any(role_id in allowed_role_ids for role_id in user_role_ids)
+                has_permission = has_any_role_id(interaction.user, allowed_role_ids)
             else:
                 has_permission = False
 
@@ -358,11 +354,10 @@ def setup_character_commands(bot, db, guild_id):
         sheet_url="New character sheet URL (optional, use 'remove' to clear)"
     )
     @app_commands.autocomplete(char_name=character_autocomplete)
-    @app_commands.checks.cooldown(3, 60.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(3, 60.0, key=user_cooldown_key)
     async def xp_edit(interaction: discord.Interaction, char_name: str,
                      new_name: str = None, image_url: str = None, sheet_url: str = None):
         user_id = interaction.user.id
-        await db.ensure_user(user_id)
 
         # Check if at least one field is being updated
         if not any([new_name, image_url, sheet_url]):
@@ -373,68 +368,54 @@ def setup_character_commands(bot, db, guild_id):
             return
 
         # Find the character (with fuzzy matching)
-        chars = await db.list_characters(user_id)
-        char_names = [c['name'] for c in chars]
+        char_names = await db.get_all_character_names(user_id)
         matched_name = char_name
 
         if char_name not in char_names:
             # Try fuzzy match
-            matches = difflib.get_close_matches(char_name, char_names, n=1, cutoff=0.6)
-            if not matches:
+            matched_name = closest_name(char_name, tuple(char_names))
+            if not matched_name:
                 await interaction.response.send_message(f"❌ Character '{char_name}' not found.", ephemeral=True)
                 return
-            matched_name = matches[0]
 
-        # Validate new name if provided
-        if new_name:
-            is_valid, error_msg = validate_character_name(new_name)
+        # Validate each provided field; URLs can be cleared with 'remove'
+        updates = {}
+        for field, value, validate, label, removable in (
+            ("new_name", new_name, validate_character_name, "New name", False),
+            ("image_url", image_url, validate_image_url, "Image URL", True),
+            ("character_sheet_url", sheet_url, validate_character_sheet_url, "Character sheet URL", True),
+        ):
+            if not value:
+                continue
+            if removable and value.lower() == 'remove':
+                updates[field] = ''  # Empty string to remove
+                continue
+            is_valid, error_msg = validate(value)
             if not is_valid:
-                await interaction.response.send_message(f"❌ New name: {error_msg}", ephemeral=True)
+                await interaction.response.send_message(f"❌ {label}: {error_msg}", ephemeral=True)
                 return
-            new_name = new_name.strip()
+            updates[field] = value.strip() if field == "new_name" else value
 
-        # Handle image_url
-        processed_image_url = None
-        if image_url:
-            if image_url.lower() == 'remove':
-                processed_image_url = ''  # Empty string to remove
-            else:
-                is_valid, error_msg = validate_image_url(image_url)
-                if not is_valid:
-                    await interaction.response.send_message(f"❌ Image URL: {error_msg}", ephemeral=True)
-                    return
-                processed_image_url = image_url
-
-        # Handle sheet_url
-        processed_sheet_url = None
-        if sheet_url:
-            if sheet_url.lower() == 'remove':
-                processed_sheet_url = ''  # Empty string to remove
-            else:
-                is_valid, error_msg = validate_character_sheet_url(sheet_url)
-                if not is_valid:
-                    await interaction.response.send_message(f"❌ Character sheet URL: {error_msg}", ephemeral=True)
-                    return
-                processed_sheet_url = sheet_url
+        # Renaming to the current name is a no-op; skip the write if nothing else changes
+        if updates.get("new_name") == matched_name:
+            del updates["new_name"]
+        if not updates:
+            await interaction.response.send_message(f"ℹ️ No changes to '{matched_name}'.", ephemeral=True)
+            return
+        new_name = updates.get("new_name")
 
         # Update character
         try:
-            success = await db.update_character(
-                user_id,
-                matched_name,
-                new_name=new_name,
-                image_url=processed_image_url,
-                character_sheet_url=processed_sheet_url
-            )
+            success = await db.update_character(user_id, matched_name, **updates)
 
             if success:
                 updated_fields = []
                 if new_name:
                     updated_fields.append(f"name → '{new_name}'")
-                if processed_image_url is not None:
-                    updated_fields.append("image" + (" removed" if processed_image_url == '' else " updated"))
-                if processed_sheet_url is not None:
-                    updated_fields.append("character sheet" + (" removed" if processed_sheet_url == '' else " updated"))
+                if "image_url" in updates:
+                    updated_fields.append("image" + (" removed" if updates["image_url"] == '' else " updated"))
+                if "character_sheet_url" in updates:
+                    updated_fields.append("character sheet" + (" removed" if updates["character_sheet_url"] == '' else " updated"))
 
                 display_name = new_name if new_name else matched_name
                 await interaction.response.send_message(
@@ -471,27 +452,30 @@ def setup_character_commands(bot, db, guild_id):
         memo="Reason for XP request"
     )
     @app_commands.autocomplete(char_name=character_autocomplete)
-    @app_commands.checks.cooldown(5, 300.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(5, 300.0, key=user_cooldown_key)
     async def xp_request(interaction: discord.Interaction, char_name: str, amount: int, memo: str):
         user_id = interaction.user.id
-        await db.ensure_user(user_id)
+
+        # Load the user, their characters, and the request channel together
+        (characters, _), request_channel_id = await asyncio.gather(
+            db.ensure_user_and_list_characters(user_id),
+            db.get_xp_request_channel(guild_id)
+        )
 
         # Check if user has any characters
-        characters = await db.list_characters(user_id)
         if not characters:
             await interaction.response.send_message("❌ You don't have any characters yet.", ephemeral=True)
             return
 
-        # Find the character
-        char = await db.get_character(user_id, char_name)
+        # Find the character (with fuzzy matching) in the rows already loaded
+        chars_by_name = {c['name']: c for c in characters}
+        char = chars_by_name.get(char_name)
         if not char:
-            # Try fuzzy match
-            char_names = [c['name'] for c in characters]
-            matches = difflib.get_close_matches(char_name, char_names, n=1, cutoff=0.6)
-            if not matches:
+            matched_name = closest_name(char_name, tuple(chars_by_name))
+            if not matched_name:
                 await interaction.response.send_message(f"❌ Character '{char_name}' not found.", ephemeral=True)
                 return
-            char = await db.get_character(user_id, matches[0])
+            char = chars_by_name[matched_name]
 
         # Validate amount
         if amount <= 0:
@@ -503,7 +487,6 @@ def setup_character_commands(bot, db, guild_id):
             return
 
         # Check if request channel is configured
-        request_channel_id = await db.get_xp_request_channel(guild_id)
         if not request_channel_id:
             await interaction.response.send_message(
                 "❌ XP request channel is not configured. Contact an administrator.",
@@ -520,59 +503,12 @@ def setup_character_commands(bot, db, guild_id):
             )
             return
 
-        # Get current level and XP info
-        from utils.xp import get_level_and_progress
-        xp_amount = char['xp']
-        level, progress, required = get_level_and_progress(xp_amount)
-
-        # Create the request embed
-        embed = discord.Embed(
-            title=f"XP Request - {char['name']}",
-            color=discord.Color.blue(),
-            timestamp=discord.utils.utcnow()
-        )
-
-        # Player ID field
-        embed.add_field(
-            name="**Player**",
-            value=f"<@{user_id}>",
-            inline=False
-        )
-
-        # Current Level and Total XP (inline)
-        embed.add_field(
-            name="**Current Level**",
-            value=str(level),
-            inline=True
+        # Create the request embed from the character's current level and XP
+        embed = _build_request_embed(
+            char['name'], user_id, char['xp'], amount, memo,
+            char.get("image_url") or DEFAULT_CHARACTER_IMAGE, interaction.user.display_name
         )
 
-        embed.add_field(
-            name="**Current Total XP**",
-            value=f"{xp_amount:,}",
-            inline=True
-        )
-
-        # Requested amount
-        embed.add_field(
-            name="**Requested Amount**",
-            value=f"{amount:,} XP",
-            inline=False
-        )
-
-        # Reason
-        embed.add_field(
-            name="**Reason**",
-            value=memo,
-            inline=False
-        )
-
-        # Add character image as thumbnail
-        from ui.character_view import DEFAULT_CHARACTER_IMAGE
-        image_url = char.get("image_url") or DEFAULT_CHARACTER_IMAGE
-        embed.set_thumbnail(url=image_url)
-
-        embed.set_footer(text=f"Request by {interaction.user.display_name}")
-
         # Create the approval view
         view = XPRequestView(user_id, char['id'], char['name'], user_id, amount, memo, db)
 
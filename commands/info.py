@@ -5,6 +5,7 @@ import logging
 import discord
 from discord import app_commands
 from utils.validation import validate_timezone
+from utils.cooldown import user_cooldown_key
 
 logger = logging.getLogger('xp-bot')
 
@@ -13,7 +14,7 @@ def setup_info_commands(bot, db, guild_id):
     """Register informational commands"""
 
     @bot.tree.command(name="xp_tracking")
-    @app_commands.checks.cooldown(1, 60.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(1, 60.0, key=user_cooldown_key)
     async def xp_tracking(interaction: discord.Interaction):
         """Show which channels have XP tracking enabled"""
         config = await db.get_config(guild_id)
@@ -28,7 +29,7 @@ def setup_info_commands(bot, db, guild_id):
 
     @bot.tree.command(name="xp_set_timezone")
     @app_commands.describe(timezone="Your timezone, e.g. America/New_York")
-    @app_commands.checks.cooldown(1, 300.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(1, 300.0, key=user_cooldown_key)
     async def xp_set_timezone(interaction: discord.Interaction, timezone: str):
         """Set your personal timezone for daily XP resets"""
         user_id = interaction.user.id
@@ -40,12 +41,11 @@ def setup_info_commands(bot, db, guild_id):
             logger.debug(f"Invalid timezone '{timezone}' from user {user_id}")
             return
 
-        await db.ensure_user(user_id)
         await db.set_user_timezone(user_id, timezone)
         await interaction.response.send_message(f"✅ Timezone set to {timezone}.", ephemeral=True)
 
     @bot.tree.command(name="xp_sync")
-    @app_commands.checks.cooldown(1, 300.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(1, 300.0, key=user_cooldown_key)
     async def xp_sync(interaction: discord.Interaction):
         """Re-sync slash commands to this server"""
         guild = discord.Object(id=guild_id)
@@ -53,7 +53,7 @@ def setup_info_commands(bot, db, guild_id):
         await interaction.response.send_message("🔁 Slash commands re-synced to this server.", ephemeral=True)
 
     @bot.tree.command(name="xp_help")
-    @app_commands.checks.cooldown(1, 60.0, key=lambda i: i.user.id)
+    @app_commands.checks.cooldown(1, 60.0, key=user_cooldown_key)
     async def xp_help(interaction: discord.Interaction):
         """Show help information for all XP Bot commands"""
         embed = discord.Embed(title="📜 XP Bot Help", description="Slash commands to manage your XP and characters:")
@@ -9,6 +9,7 @@ from datetime import date, datetime
 from typing import Optional, List
 from utils.xp import get_level_and_progress
 from utils.quest_xp import calculate_quest_xp
+from utils.permissions import has_any_role_id
 from ui.quest_view import QuestEndConfirmView, QuestDeleteConfirmView
 
 logger = logging.getLogger('xp-bot')
@@ -34,15 +35,14 @@ def setup_quest_commands(bot, db, guild_id):
             return True
 
         # Check if user has any of the DM roles (using character creation roles)
-        allowed_role_ids = await db.get_character_creation_roles(guild_id)
+        allowed_role_ids = await db.get_character_creation_role_ids(guild_id)
 
         # If no roles configured, allow everyone
         if not allowed_role_ids:
             return True
 
         # Check if user has any allowed role
-        user_role_ids = [role.id for role in interaction.user.roles]
-        return any(role_id in allowed_role_ids for role_id in user_role_ids)
+        return has_any_role_id(interaction.user, allowed_role_ids)
 
     async def active_quest_autocomplete(interaction: discord.Interaction, current: str):
         """Autocomplete for active quest names"""
@@ -88,15 +88,12 @@ def setup_quest_commands(bot, db, guild_id):
     async def user_characters_autocomplete(interaction: discord.Interaction, current: str):
         """Autocomplete for user's own character names"""
         try:
-            user_id = interaction.user.id
-            await db.ensure_user(user_id)
-            characters = await db.list_characters(user_id)
+            name_index = await db.get_character_name_index(interaction.user.id)
 
-            # Filter by current input
-            filtered = [c for c in characters if current.lower() in c['name'].lower()]
+            # Filter by current input, prefix matches first
             return [
-                app_commands.Choice(name=c['name'], value=c['name'])
-                for c in filtered[:25]
+                app_commands.Choice(name=name, value=name)
+                for name in name_index.search(current)
             ]
         except Exception as e:
             logger.error(f"Error in user characters autocomplete: {e}")
@@ -717,18 +714,15 @@ def setup_quest_commands(bot, db, guild_id):
 
         # DMs
         if dms:
-            dm_list = []
-            for dm in dms:
-                dm_tag = " (Primary)" if dm['is_primary'] else ""
-                dm_list.append(f"<@{dm['user_id']}>{dm_tag}")
-            embed.add_field(name=f"DMs ({len(dms)})", value="\n".join(dm_list), inline=True)
+            dm_lines = "\n".join(
+                f"<@{dm['user_id']}>{' (Primary)' if dm['is_primary'] else ''}" for dm in dms
+            )
+            embed.add_field(name=f"DMs ({len(dms)})", value=dm_lines, inline=True)
 
         # Participants
         if participants:
-            pc_list = []
-            for p in participants:
-                pc_list.append(f"{p['character_name']} (Lvl {p['starting_level']})")
-            embed.add_field(name=f"Participants ({len(participants)})", value="\n".join(pc_list), inline=True)
+            pc_lines = "\n".join(f"{p['character_name']} (Lvl {p['starting_level']})" for p in participants)
+            embed.add_field(name=f"Participants ({len(participants)})", value=pc_lines, inline=True)
         else:
             embed.add_field(name="Participants", value="*No participants yet*", inline=True)
 
@@ -869,18 +863,15 @@ def setup_quest_commands(bot, db, guild_id):
 
         # DMs
         if dms:
-            dm_list = []
-            for dm in dms:
-                dm_tag = " (Primary)" if dm['is_primary'] else ""
-                dm_list.append(f"<@{dm['user_id']}>{dm_tag}")
-            embed.add_field(name=f"DMs ({len(dms)})", value="\n".join(dm_list), inline=True)
+            dm_lines = "\n".join(
+                f"<@{dm['user_id']}>{' (Primary)' if dm['is_primary'] else ''}" for dm in dms
+            )
+            embed.add_field(name=f"DMs ({len(dms)})", value=dm_lines, inline=True)
 
         # Participants
         if participants:
-            pc_list = []
-            for p in participants:
-                pc_list.append(f"{p['character_name']} (Lvl {p['starting_level']})")
-            embed.add_field(name=f"Participants ({len(participants)})", value="\n".join(pc_list), inline=True)
+            pc_lines = "\n".join(f"{p['character_name']} (Lvl {p['starting_level']})" for p in participants)
+            embed.add_field(name=f"Participants ({len(participants)})", value=pc_lines, inline=True)
 
         # Monsters and XP Calculation
         if monsters:
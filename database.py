@@ -2,7 +2,10 @@
 Database layer for XP Bot using asyncpg
 """
 import os
+import time
+import asyncio
 import logging
+from collections import OrderedDict
 import asyncpg
 from datetime import date
 from typing import Optional, Dict, List, Tuple
@@ -14,13 +17,53 @@ from utils.exceptions import (
     DuplicateCharacterError
 )
 from utils.retry import retry_on_db_error
+from utils.xp import get_level_and_progress
+from utils.search import NameIndex
 
 logger = logging.getLogger('xp-bot.database')
 
+# How long a guild config row is served from memory before re-reading it
+CONFIG_CACHE_TTL = 60.0
+
+# Autocomplete fires per keystroke; briefly reuse name search results for repeated prefixes
+NAME_SEARCH_CACHE_TTL = 5.0
+NAME_SEARCH_CACHE_SIZE = 256
+
+# Insert-or-select of a users row as CTE "u". ON CONFLICT DO NOTHING returns nothing for an existing user,
+# so the row is read without writing it. Run it through Database._fetchrow_ensuring_user, which covers the
+# case where another connection inserts the same user concurrently
+_ENSURE_USER_CTE = """
+    ins AS (
+        INSERT INTO users (user_id, timezone, last_xp_reset)
+        VALUES ($1, 'UTC', CURRENT_DATE)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING *
+    ), u AS (
+        SELECT * FROM ins
+        UNION ALL
+        SELECT * FROM users WHERE user_id = $1
+    )"""
+
+# Per-user character name lists back autocomplete. Writes invalidate them, and a read that overlapped a
+# write is not cached, so the TTL only bounds staleness from writes made outside this process
+CHARACTER_NAMES_CACHE_TTL = 30.0
+
 
 class Database:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        # guild_id -> (expires_at, config, rp_channel_ids, survival_channel_ids, creation_role_ids)
+        self._config_cache: Dict[int, Tuple[float, Dict, frozenset, frozenset, frozenset]] = {}
+        # (search.lower(), limit, include_retired) -> (expires_at, names), oldest first
+        self._name_search_cache: "OrderedDict[Tuple[str, int, bool], Tuple[float, List[str]]]" = OrderedDict()
+        # user_id -> (expires_at, index over non-retired character names in creation order)
+        self._character_names_cache: Dict[int, Tuple[float, NameIndex]] = {}
+        # user_id -> count of invalidations, so a fetch that raced a write doesn't cache what it read
+        self._character_names_generation: Dict[int, int] = {}
+        # user_ids known to have a users row; only purge_user deletes rows, and it discards the id
+        self._ensured_users: set = set()
+        # (method, *args) -> task for a read currently in flight, shared by identical concurrent calls
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
     async def connect(self):
         """Initialize database connection pool"""
@@ -83,7 +126,12 @@ class Database:
     # ==================== CONFIG METHODS ====================
 
     async def get_config(self, guild_id: int) -> Dict:
-        """Get guild configuration, create if doesn't exist"""
+        """Get guild configuration, create if doesn't exist
+        Served from an in-memory cache; every config write below invalidates it"""
+        cached = self._config_cache.get(guild_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         async with self.pool.acquire() as conn:
             config = await conn.fetchrow(
                 "SELECT * FROM config WHERE guild_id = $1",
@@ -99,7 +147,25 @@ class Database:
                     RETURNING *
                 """, guild_id)
 
-            return dict(config)
+            config = dict(config)
+            self._config_cache[guild_id] = (
+                time.monotonic() + CONFIG_CACHE_TTL,
+                config,
+                frozenset(config.get('rp_channels') or ()),
+                frozenset(config.get('survival_channels') or ()),
+                frozenset(config.get('character_creation_roles') or ())
+            )
+            return config
+
+    async def get_tracked_channels(self, guild_id: int) -> Tuple[frozenset, frozenset]:
+        """Get (rp_channel_ids, survival_channel_ids) as frozensets for fast membership checks"""
+        await self.get_config(guild_id)
+        _, _, rp_channel_ids, survival_channel_ids, _ = self._config_cache[guild_id]
+        return rp_channel_ids, survival_channel_ids
+
+    def invalidate_config(self, guild_id: int):
+        """Drop the cached config so the next read hits the database"""
+        self._config_cache.pop(guild_id, None)
 
     async def update_config(self, guild_id: int, **kwargs):
         """Update guild configuration"""
@@ -119,26 +185,67 @@ class Database:
 
         async with self.pool.acquire() as conn:
             await conn.execute(query, *values)
+        self.invalidate_config(guild_id)
+
+    async def update_rp_settings(self, guild_id: int, char_per_rp: int, daily_rp_cap: int):
+        """Update RP XP rate and daily cap (fixed statement so asyncpg can reuse the prepared plan)"""
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE config
+                SET char_per_rp = $2, daily_rp_cap = $3, updated_at = NOW()
+                WHERE guild_id = $1
+            """, guild_id, char_per_rp, daily_rp_cap)
+        self.invalidate_config(guild_id)
 
-    async def add_rp_channel(self, guild_id: int, channel_id: int):
-        """Add channel to RP tracking list"""
+    async def set_rp_channels(self, guild_id: int, channel_ids: List[int]):
+        """Replace the RP tracking channel list"""
         async with self.pool.acquire() as conn:
             await conn.execute("""
+                UPDATE config
+                SET rp_channels = $2, updated_at = NOW()
+                WHERE guild_id = $1
+            """, guild_id, channel_ids)
+        self.invalidate_config(guild_id)
+
+    async def add_rp_channel(self, guild_id: int, channel_id: int) -> bool:
+        """Add channel to RP tracking list
+        Returns True if the channel was added, False if it was already tracked"""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("""
                 UPDATE config
                 SET rp_channels = array_append(rp_channels, $2),
                     updated_at = NOW()
                 WHERE guild_id = $1 AND NOT ($2 = ANY(rp_channels))
             """, guild_id, channel_id)
+        self.invalidate_config(guild_id)
+        return result == "UPDATE 1"
 
-    async def remove_rp_channel(self, guild_id: int, channel_id: int):
-        """Remove channel from RP tracking list"""
+    async def add_rp_channels_bulk(self, guild_id: int, channel_ids: List[int]):
+        """Add several channels to RP tracking list in one statement, skipping ones already tracked"""
         async with self.pool.acquire() as conn:
             await conn.execute("""
                 UPDATE config
-                SET rp_channels = array_remove(rp_channels, $2),
+                SET rp_channels = rp_channels || ARRAY(
+                        SELECT DISTINCT cid FROM unnest($2::BIGINT[]) AS cid
+                        WHERE NOT (cid = ANY(rp_channels))
+                    ),
                     updated_at = NOW()
                 WHERE guild_id = $1
+            """, guild_id, channel_ids)
+        self.invalidate_config(guild_id)
+
+    async def remove_rp_channel(self, guild_id: int, channel_id: int) -> bool:
+        """Remove channel from RP tracking list
+        Returns True if the channel was removed, False if it wasn't tracked"""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("""
+                UPDATE config
+                SET rp_channels = array_remove(rp_channels, $2),
+                    updated_at = NOW()
+                WHERE guild_id = $1 AND $2 = ANY(rp_channels)
             """, guild_id, channel_id)
+        self.invalidate_config(guild_id)
+        return result == "UPDATE 1"
 
     async def add_survival_channel(self, guild_id: int, channel_id: int):
         """Add channel to survival (prized species) tracking list"""
@@ -149,6 +256,7 @@ class Database:
                     updated_at = NOW()
                 WHERE guild_id = $1 AND NOT ($2 = ANY(survival_channels))
             """, guild_id, channel_id)
+        self.invalidate_config(guild_id)
 
     async def remove_survival_channel(self, guild_id: int, channel_id: int):
         """Remove channel from survival (prized species) tracking list"""
@@ -159,6 +267,7 @@ class Database:
                     updated_at = NOW()
                 WHERE guild_id = $1
             """, guild_id, channel_id)
+        self.invalidate_config(guild_id)
 
     async def add_character_creation_role(self, guild_id: int, role_id: int):
         """Add role to character creation permissions"""
@@ -169,6 +278,7 @@ class Database:
                     updated_at = NOW()
                 WHERE guild_id = $1 AND NOT ($2 = ANY(character_creation_roles))
             """, guild_id, role_id)
+        self.invalidate_config(guild_id)
 
     async def remove_character_creation_role(self, guild_id: int, role_id: int):
         """Remove role from character creation permissions"""
@@ -179,21 +289,36 @@ class Database:
                     updated_at = NOW()
                 WHERE guild_id = $1
             """, guild_id, role_id)
+        self.invalidate_config(guild_id)
 
     async def get_character_creation_roles(self, guild_id: int) -> list:
         """Get list of role IDs allowed to create characters"""
         config = await self.get_config(guild_id)
         return config.get('character_creation_roles', [])
 
-    async def set_xp_request_channel(self, guild_id: int, channel_id: int):
-        """Set the channel where XP requests are posted"""
-        await self.update_config(guild_id, xp_request_channel=channel_id)
+    async def get_character_creation_role_ids(self, guild_id: int) -> frozenset:
+        """Get role IDs allowed to create characters as a frozenset for fast membership checks"""
+        await self.get_config(guild_id)
+        return self._config_cache[guild_id][4]
+
+    async def set_xp_request_channel(self, guild_id: int, channel_id: int, webhook_url: Optional[str] = None):
+        """Set the channel where XP requests are posted, along with its webhook URL if one was created"""
+        await self.update_config(guild_id, xp_request_channel=channel_id, xp_request_webhook_url=webhook_url)
 
     async def get_xp_request_channel(self, guild_id: int) -> Optional[int]:
         """Get the XP request channel ID"""
         config = await self.get_config(guild_id)
         return config.get('xp_request_channel')
 
+    async def get_xp_request_webhook_url(self, guild_id: int) -> Optional[str]:
+        """Get the webhook URL for the XP request channel"""
+        config = await self.get_config(guild_id)
+        return config.get('xp_request_webhook_url')
+
+    async def clear_xp_request_webhook_url(self, guild_id: int):
+        """Forget the XP request channel's webhook so posts go through the channel itself"""
+        await self.update_config(guild_id, xp_request_webhook_url=None)
+
     async def get_log_channel(self) -> Optional[int]:
         """Get the log channel ID (XP request channel) for the first configured guild
         This is a helper method for code that doesn't have access to guild_id"""
@@ -203,25 +328,47 @@ class Database:
             )
             return result
 
+    async def _coalesce(self, key: tuple, fetch):
+        """Run fetch() once for concurrent callers with the same key; they all get its result
+        Callers share the returned objects, so they must not mutate them"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            # A write may already have replaced this entry; only drop it if it's still ours
+            task.add_done_callback(
+                lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None
+            )
+        # Shield so one caller being cancelled doesn't cancel the query for the others
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, user_id: int):
+        """Stop new callers joining reads of user_id's rows that started before a write
+        Every coalesce key carries the user ID second; reads already waiting keep their result"""
+        for key in [key for key in self._inflight if key[1] == user_id]:
+            del self._inflight[key]
+
     # ==================== USER METHODS ====================
 
+    async def _fetchrow_ensuring_user(self, conn, query: str, user_id: int):
+        """Run a query built on _ENSURE_USER_CTE, retrying once if it lost an insert race
+        When another connection inserts the same user first, our INSERT waits for it and then does nothing,
+        while our SELECT still uses the snapshot from before their commit, so no row comes back. A second
+        run takes a fresh snapshot that sees the committed row"""
+        row = await conn.fetchrow(query, user_id)
+        if row is None:
+            row = await conn.fetchrow(query, user_id)
+        return row
+
     async def ensure_user(self, user_id: int) -> Dict:
         """Get or create user, returns user data with active character info"""
         async with self.pool.acquire() as conn:
-            user = await conn.fetchrow(
-                "SELECT * FROM users WHERE user_id = $1",
-                user_id
-            )
+            # Insert-or-select in one round-trip; an existing user is read without writing the row
+            user = await self._fetchrow_ensuring_user(conn, f"WITH {_ENSURE_USER_CTE} SELECT * FROM u", user_id)
 
-            if not user:
-                # Create new user
-                user = await conn.fetchrow("""
-                    INSERT INTO users (user_id, timezone, last_xp_reset)
-                    VALUES ($1, 'UTC', CURRENT_DATE)
-                    RETURNING *
-                """, user_id)
-
-            return dict(user)
+        user = dict(user)
+        self._ensured_users.add(user_id)
+        return user
 
     async def get_user_timezone(self, user_id: int) -> str:
         """Get user's timezone"""
@@ -233,14 +380,15 @@ class Database:
             return result or 'UTC'
 
     async def set_user_timezone(self, user_id: int, timezone: str):
-        """Set user's timezone"""
-        await self.ensure_user(user_id)
+        """Set user's timezone, creating the user if needed"""
         async with self.pool.acquire() as conn:
             await conn.execute("""
-                UPDATE users
-                SET timezone = $2, updated_at = NOW()
-                WHERE user_id = $1
+                INSERT INTO users (user_id, timezone, last_xp_reset)
+                VALUES ($1, $2, CURRENT_DATE)
+                ON CONFLICT (user_id) DO UPDATE
+                SET timezone = EXCLUDED.timezone, updated_at = NOW()
             """, user_id, timezone)
+        self._ensured_users.add(user_id)
 
     async def get_last_xp_reset(self, user_id: int) -> Optional[date]:
         """Get user's last XP reset date"""
@@ -259,21 +407,68 @@ class Database:
                 WHERE user_id = $1
             """, user_id, reset_date)
 
+    async def fetch_rp_context(self, user_id: int) -> Dict:
+        """Ensure the user exists and fetch what RP tracking needs in a single query
+        Returns dict with: timezone, last_xp_reset, active_character (dict or None)"""
+        async with self.pool.acquire() as conn:
+            # At most one branch of the UNION returns a row: the INSERT and the SELECT share a snapshot
+            row = await self._fetchrow_ensuring_user(conn, f"""
+                WITH {_ENSURE_USER_CTE}
+                SELECT u.timezone AS user_timezone, u.last_xp_reset AS user_last_xp_reset, c.*
+                FROM u
+                LEFT JOIN characters c ON c.id = u.active_character_id AND c.retired = FALSE
+                LIMIT 1
+            """, user_id)
+
+            active_character = dict(row)
+            timezone = active_character.pop('user_timezone')
+            last_xp_reset = active_character.pop('user_last_xp_reset')
+            return {
+                'timezone': timezone or 'UTC',
+                'last_xp_reset': last_xp_reset,
+                'active_character': active_character if active_character['id'] is not None else None
+            }
+
+    async def apply_daily_reset(self, user_id: int, reset_date: date):
+        """Reset daily caps for all user's characters and record the reset date in one transaction"""
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    UPDATE characters
+                    SET daily_xp = 0,
+                        char_buffer = 0,
+                        updated_at = NOW()
+                    WHERE user_id = $1
+                """, user_id)
+                await conn.execute("""
+                    UPDATE users
+                    SET last_xp_reset = $2, updated_at = NOW()
+                    WHERE user_id = $1
+                """, user_id, reset_date)
+        self._forget_inflight(user_id)
+
     # ==================== CHARACTER METHODS ====================
 
     @retry_on_db_error(max_attempts=2)
     async def create_character(self, user_id: int, name: str, image_url: Optional[str] = None, character_sheet_url: Optional[str] = None, starting_xp: int = 0) -> int:
         """Create a new character with optional starting XP, returns character ID"""
-        await self.ensure_user(user_id)
+        if user_id not in self._ensured_users:
+            await self.ensure_user(user_id)
 
         try:
             async with self.pool.acquire() as conn:
+                # The partial unique index only covers non-retired characters, so a retired name can be reused
                 char_id = await conn.fetchval("""
                     INSERT INTO characters (user_id, name, image_url, character_sheet_url, xp, daily_xp, char_buffer)
                     VALUES ($1, $2, $3, $4, $5, 0, 0)
+                    ON CONFLICT (user_id, name) WHERE retired = FALSE DO NOTHING
                     RETURNING id
                 """, user_id, name, image_url, character_sheet_url, starting_xp)
 
+                if char_id is None:
+                    logger.warning(f"Duplicate character name '{name}' for user {user_id}")
+                    raise DuplicateCharacterError(name, user_id)
+
                 # Set as active character if user has no active character
                 await conn.execute("""
                     UPDATE users
@@ -282,10 +477,10 @@ class Database:
                 """, user_id, char_id)
 
                 logger.info(f"Created character '{name}' (ID: {char_id}) for user {user_id}")
+                self.invalidate_character_names(user_id)
                 return char_id
-        except asyncpg.UniqueViolationError:
-            logger.warning(f"Duplicate character name '{name}' for user {user_id}")
-            raise DuplicateCharacterError(name, user_id) from None
+        except DuplicateCharacterError:
+            raise
         except asyncpg.PostgresError as e:
             logger.error(f"Database error creating character '{name}' for user {user_id}: {e}")
             raise DatabaseError(f"Failed to create character") from e
@@ -312,6 +507,7 @@ class Database:
                 char['id']
             )
 
+            self.invalidate_character_names(user_id)
             return True
 
     async def retire_character(self, user_id: int, name: str) -> bool:
@@ -342,6 +538,7 @@ class Database:
             """, user_id, char['id'])
 
             logger.info(f"Retired character '{name}' (ID: {char['id']}) for user {user_id}")
+            self.invalidate_character_names(user_id)
             return True
 
     async def restore_character(self, user_id: int, name: str) -> bool:
@@ -364,44 +561,48 @@ class Database:
             """, char['id'])
 
             logger.info(f"Restored character '{name}' (ID: {char['id']}) for user {user_id}")
+            self.invalidate_character_names(user_id)
             return True
 
-    async def purge_user(self, user_id: int) -> bool:
+    async def purge_user(self, user_id: int) -> int:
         """Permanently delete a user and all their characters (for GDPR compliance)
-        Returns True if user existed and was deleted"""
+        Returns the number of characters deleted; users with no characters are left untouched"""
         async with self.pool.acquire() as conn:
-            # Check if user exists
-            user = await conn.fetchrow(
-                "SELECT user_id FROM users WHERE user_id = $1",
-                user_id
-            )
-
-            if not user:
-                return False
-
-            # Delete user (CASCADE will delete all characters and related data)
-            await conn.execute(
-                "DELETE FROM users WHERE user_id = $1",
-                user_id
-            )
+            # Count and delete in one round-trip (CASCADE will delete all characters and related data)
+            char_count = await conn.fetchval("""
+                WITH counted AS (
+                    SELECT COUNT(*) AS n FROM characters WHERE user_id = $1
+                ), deleted AS (
+                    DELETE FROM users
+                    WHERE user_id = $1 AND (SELECT n FROM counted) > 0
+                    RETURNING user_id
+                )
+                SELECT n FROM counted
+            """, user_id)
 
-            logger.warning(f"PURGED user {user_id} and all their characters from database")
-            return True
+            if char_count:
+                logger.warning(f"PURGED user {user_id} and all their characters from database")
+                self._ensured_users.discard(user_id)
+                self.invalidate_character_names(user_id)
+            return char_count
 
     async def get_character(self, user_id: int, name: str, include_retired: bool = False) -> Optional[Dict]:
         """Get character by name (excludes retired by default)"""
-        async with self.pool.acquire() as conn:
-            if include_retired:
-                char = await conn.fetchrow(
-                    "SELECT * FROM characters WHERE user_id = $1 AND name = $2",
-                    user_id, name
-                )
-            else:
-                char = await conn.fetchrow(
-                    "SELECT * FROM characters WHERE user_id = $1 AND name = $2 AND retired = FALSE",
-                    user_id, name
-                )
-            return dict(char) if char else None
+        async def fetch():
+            async with self.pool.acquire() as conn:
+                if include_retired:
+                    char = await conn.fetchrow(
+                        "SELECT * FROM characters WHERE user_id = $1 AND name = $2",
+                        user_id, name
+                    )
+                else:
+                    char = await conn.fetchrow(
+                        "SELECT * FROM characters WHERE user_id = $1 AND name = $2 AND retired = FALSE",
+                        user_id, name
+                    )
+                return dict(char) if char else None
+
+        return await self._coalesce(('get_character', user_id, name, include_retired), fetch)
 
     async def get_active_character(self, user_id: int) -> Optional[Dict]:
         """Get user's active character (excludes retired)"""
@@ -431,38 +632,101 @@ class Database:
                 SET active_character_id = $2, updated_at = NOW()
                 WHERE user_id = $1
             """, user_id, char['id'])
+            self._forget_inflight(user_id)
 
             return True
 
     async def list_characters(self, user_id: int, include_retired: bool = False) -> List[Dict]:
         """List all characters for a user (excludes retired by default)"""
-        async with self.pool.acquire() as conn:
-            if include_retired:
-                chars = await conn.fetch(
-                    "SELECT * FROM characters WHERE user_id = $1 ORDER BY created_at",
-                    user_id
-                )
-            else:
-                chars = await conn.fetch(
-                    "SELECT * FROM characters WHERE user_id = $1 AND retired = FALSE ORDER BY created_at",
-                    user_id
-                )
-            return [dict(char) for char in chars]
+        async def fetch():
+            async with self.pool.acquire() as conn:
+                if include_retired:
+                    chars = await conn.fetch(
+                        "SELECT * FROM characters WHERE user_id = $1 ORDER BY created_at",
+                        user_id
+                    )
+                else:
+                    chars = await conn.fetch(
+                        "SELECT * FROM characters WHERE user_id = $1 AND retired = FALSE ORDER BY created_at",
+                        user_id
+                    )
+                return [dict(char) for char in chars]
+
+        return await self._coalesce(('list_characters', user_id, include_retired), fetch)
+
+    async def ensure_user_and_list_characters(self, user_id: int) -> Tuple[List[Dict], Optional[int]]:
+        """Create the user if needed and list their non-retired characters in one round-trip
+        Returns (characters, active_index); active_index is the active character's position, or None if unset"""
+        async def fetch():
+            async with self.pool.acquire() as conn:
+                # A newly inserted user has no characters yet, so the SELECT not seeing the insert is fine
+                rows = await conn.fetch("""
+                    WITH new_user AS (
+                        INSERT INTO users (user_id, timezone, last_xp_reset)
+                        VALUES ($1, 'UTC', CURRENT_DATE)
+                        ON CONFLICT (user_id) DO NOTHING
+                    )
+                    SELECT c.*, (c.id = u.active_character_id) AS is_active
+                    FROM characters c
+                    JOIN users u ON u.user_id = c.user_id
+                    WHERE c.user_id = $1 AND c.retired = FALSE
+                    ORDER BY c.created_at
+                """, user_id)
+
+            self._ensured_users.add(user_id)
+            characters = []
+            active_index = None
+            for i, row in enumerate(rows):
+                char = dict(row)
+                if char.pop('is_active'):
+                    active_index = i
+                characters.append(char)
+            return characters, active_index
+
+        return await self._coalesce(('ensure_user_and_list_characters', user_id), fetch)
 
     async def get_all_character_names(self, user_id: int, include_retired: bool = False) -> List[str]:
         """Get list of character names for a user (excludes retired by default)"""
+        if not include_retired:
+            return (await self.get_character_name_index(user_id)).names
+
         async with self.pool.acquire() as conn:
-            if include_retired:
-                names = await conn.fetch(
-                    "SELECT name FROM characters WHERE user_id = $1",
-                    user_id
-                )
-            else:
+            names = await conn.fetch(
+                "SELECT name FROM characters WHERE user_id = $1",
+                user_id
+            )
+            return [row['name'] for row in names]
+
+    async def get_character_name_index(self, user_id: int) -> NameIndex:
+        """Get a searchable index of a user's non-retired character names
+        Cached per user, so autocomplete keystrokes don't each hit the database. Create, delete,
+        retire, restore, rename and purge invalidate the entry, including for reads already running"""
+        cached = self._character_names_cache.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        async def fetch():
+            generation = self._character_names_generation.get(user_id, 0)
+            async with self.pool.acquire() as conn:
                 names = await conn.fetch(
-                    "SELECT name FROM characters WHERE user_id = $1 AND retired = FALSE",
+                    "SELECT name FROM characters WHERE user_id = $1 AND retired = FALSE ORDER BY created_at",
                     user_id
                 )
-            return [row['name'] for row in names]
+
+            index = NameIndex([row['name'] for row in names])
+            # A write that landed during the query may not be in these names; serve them but don't cache them
+            if self._character_names_generation.get(user_id, 0) == generation:
+                self._character_names_cache[user_id] = (time.monotonic() + CHARACTER_NAMES_CACHE_TTL, index)
+            return index
+
+        # Keystrokes that arrive while the list is loading wait on the same query
+        return await self._coalesce(('get_character_name_index', user_id), fetch)
+
+    def invalidate_character_names(self, user_id: int):
+        """Drop the cached character names so the next read hits the database"""
+        self._character_names_cache.pop(user_id, None)
+        self._character_names_generation[user_id] = self._character_names_generation.get(user_id, 0) + 1
+        self._forget_inflight(user_id)
 
     async def find_character_by_name_any_user(self, name: str, include_retired: bool = False) -> Optional[Tuple[int, Dict]]:
         """Find character by name across all users (for HF tracking)
@@ -501,7 +765,14 @@ class Database:
 
     async def search_all_character_names(self, search: str = "", limit: int = 25, include_retired: bool = False) -> List[str]:
         """Search for character names across all users (for autocomplete, excludes retired by default)
-        Returns list of character names matching search term"""
+        Returns list of character names matching search term
+        Results are cached briefly per lowercased search so keystroke bursts share one query"""
+        key = (search.lower(), limit, include_retired)
+        cached = self._name_search_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._name_search_cache.move_to_end(key)
+            return cached[1]
+
         async with self.pool.acquire() as conn:
             if include_retired:
                 if search:
@@ -525,7 +796,13 @@ class Database:
                         "SELECT DISTINCT name FROM characters WHERE retired = FALSE ORDER BY updated_at DESC LIMIT $1",
                         limit
                     )
-            return [row['name'] for row in chars]
+
+        names = [row['name'] for row in chars]
+        self._name_search_cache[key] = (time.monotonic() + NAME_SEARCH_CACHE_TTL, names)
+        self._name_search_cache.move_to_end(key)
+        if len(self._name_search_cache) > NAME_SEARCH_CACHE_SIZE:
+            self._name_search_cache.popitem(last=False)
+        return names
 
     @retry_on_db_error(max_attempts=3)
     async def award_xp(self, user_id: int, char_name: str, xp_amount: int,
@@ -551,6 +828,7 @@ class Database:
                         updated_at = NOW()
                     WHERE user_id = $1 AND name = $2
                 """, user_id, char_name, xp_amount, daily_xp_delta, char_buffer_delta)
+                self._forget_inflight(user_id)
 
                 # Get new XP
                 new_char = await conn.fetchrow("""
@@ -561,7 +839,6 @@ class Database:
                 new_xp = new_char['xp'] if new_char else old_xp
 
                 # Calculate levels
-                from utils.xp import get_level_and_progress
                 old_level, _, _ = get_level_and_progress(old_xp)
                 new_level, _, _ = get_level_and_progress(new_xp)
 
@@ -584,6 +861,48 @@ class Database:
             logger.error(f"Unexpected error awarding XP to '{char_name}' for user {user_id}: {e}")
             raise DatabaseError(f"Failed to award XP") from e
 
+    @retry_on_db_error(max_attempts=3)
+    async def apply_rp_delta(self, character_id: int, xp_delta: int, new_buffer: int) -> dict:
+        """Apply RP XP gain and the new buffer remainder in a single UPDATE
+        Returns dict with: old_xp, new_xp, old_level, new_level, leveled_up, character"""
+        try:
+            async with self.pool.acquire() as conn:
+                char = await conn.fetchrow("""
+                    UPDATE characters
+                    SET xp = xp + $2,
+                        daily_xp = daily_xp + $2,
+                        char_buffer = $3,
+                        updated_at = NOW()
+                    WHERE id = $1
+                    RETURNING *
+                """, character_id, xp_delta, new_buffer)
+        except asyncpg.PostgresError as e:
+            logger.error(f"Database error applying RP XP to character {character_id}: {e}")
+            raise DatabaseError(f"Failed to award XP") from e
+
+        if not char:
+            raise CharacterNotFoundError(str(character_id))
+        self._forget_inflight(char['user_id'])
+
+        new_xp = char['xp']
+        old_xp = new_xp - xp_delta
+
+        old_level, _, _ = get_level_and_progress(old_xp)
+        new_level, _, _ = get_level_and_progress(new_xp)
+
+        # Runs for every RP message, so skip building the message unless debug logging is on
+        if xp_delta > 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Awarded {xp_delta} RP XP to '{char['name']}' (ID: {character_id}) - Level {old_level} -> {new_level}")
+
+        return {
+            'old_xp': old_xp,
+            'new_xp': new_xp,
+            'old_level': old_level,
+            'new_level': new_level,
+            'leveled_up': new_level > old_level,
+            'character': dict(char)
+        }
+
     async def reset_daily_caps(self, user_id: int):
         """Reset daily XP caps for all user's characters"""
         async with self.pool.acquire() as conn:
@@ -594,6 +913,7 @@ class Database:
                     updated_at = NOW()
                 WHERE user_id = $1
             """, user_id)
+        self._forget_inflight(user_id)
 
     async def update_character_buffer(self, user_id: int, char_name: str, new_buffer: int):
         """Update character's buffer (for RP XP accumulation)"""
@@ -603,6 +923,49 @@ class Database:
                 SET char_buffer = $3, updated_at = NOW()
                 WHERE user_id = $1 AND name = $2
             """, user_id, char_name, new_buffer)
+        self._forget_inflight(user_id)
+
+    async def grant_xp_with_memo(self, character_id: int, amount: int, granted_by_user_id: int,
+                                 memo: Optional[str] = None) -> dict:
+        """Grant XP and log it to the audit trail in a single statement
+        Returns dict with: old_xp, new_xp, old_level, new_level, leveled_up, character"""
+        try:
+            async with self.pool.acquire() as conn:
+                char = await conn.fetchrow("""
+                    WITH upd AS (
+                        UPDATE characters
+                        SET xp = xp + $2,
+                            updated_at = NOW()
+                        WHERE id = $1
+                        RETURNING *
+                    ), ins AS (
+                        INSERT INTO xp_grants (character_id, granted_by_user_id, amount, memo)
+                        SELECT id, $3, $2, $4 FROM upd
+                    )
+                    SELECT * FROM upd
+                """, character_id, amount, granted_by_user_id, memo)
+        except asyncpg.PostgresError as e:
+            logger.error(f"Database error granting XP to character {character_id}: {e}")
+            raise DatabaseError(f"Failed to award XP") from e
+
+        if not char:
+            raise CharacterNotFoundError(str(character_id))
+        self._forget_inflight(char['user_id'])
+
+        new_xp = char['xp']
+        old_xp = new_xp - amount
+
+        old_level, _, _ = get_level_and_progress(old_xp)
+        new_level, _, _ = get_level_and_progress(new_xp)
+
+        return {
+            'old_xp': old_xp,
+            'new_xp': new_xp,
+            'old_level': old_level,
+            'new_level': new_level,
+            'leveled_up': new_level > old_level,
+            'character': dict(char)
+        }
 
     async def log_xp_grant(self, character_id: int, granted_by_user_id: int, amount: int, memo: Optional[str] = None):
         """Log an XP grant for audit trail"""
@@ -619,15 +982,6 @@ class Database:
         """
         try:
             async with self.pool.acquire() as conn:
-                # Get the character first to check if it exists
-                char = await conn.fetchrow(
-                    "SELECT id FROM characters WHERE user_id = $1 AND name = $2",
-                    user_id, old_name
-                )
-
-                if not char:
-                    return False
-
                 # Build dynamic update based on what's provided
                 updates = []
                 params = [user_id, old_name]
@@ -651,17 +1005,21 @@ class Database:
                 # Always update timestamp
                 updates.append("updated_at = NOW()")
 
-                if len(updates) == 1:  # Only timestamp, nothing to update
-                    return True
-
+                # One statement; the row count says whether the character exists
                 query = f"""
                     UPDATE characters
                     SET {', '.join(updates)}
                     WHERE user_id = $1 AND name = $2
                 """
 
-                await conn.execute(query, *params)
+                result = await conn.execute(query, *params)
+                if result == "UPDATE 0":
+                    return False
                 logger.info(f"Updated character '{old_name}' for user {user_id}")
+                if new_name is not None:
+                    self.invalidate_character_names(user_id)
+                else:
+                    self._forget_inflight(user_id)
                 return True
 
         except asyncpg.UniqueViolationError:
@@ -14,6 +14,14 @@ from utils.exceptions import (
 logger = logging.getLogger('xp-bot')
 
 
+async def _send_error(interaction, message: str):
+    """Reply with an error, using a followup if the command already acknowledged the interaction"""
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
+
+
 def setup_error_handlers(bot):
     """Register error handlers with the bot"""
 
@@ -32,51 +40,33 @@ def setup_error_handlers(bot):
             else:
                 time_str = f"{seconds}s"
 
-            await interaction.response.send_message(
-                f"⏱️ Slow down! You can use this command again in **{time_str}**.",
-                ephemeral=True
-            )
+            await _send_error(interaction, f"⏱️ Slow down! You can use this command again in **{time_str}**.")
             logger.debug(f"Rate limit hit by user {interaction.user.id} on /{interaction.command.name}")
 
         elif isinstance(error, app_commands.CheckFailure):
             # Permission check failed or other check
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command.",
-                ephemeral=True
-            )
+            await _send_error(interaction, "❌ You don't have permission to use this command.")
             logger.warning(f"Permission denied for user {interaction.user.id} on /{interaction.command.name}")
 
         elif isinstance(error, DatabaseConnectionError):
             # Database connection issues
             logger.error(f"Database connection error in /{interaction.command.name}: {error}")
-            await interaction.response.send_message(
-                "⚠️ Unable to connect to database. Please try again in a few moments.",
-                ephemeral=True
-            )
+            await _send_error(interaction, "⚠️ Unable to connect to database. Please try again in a few moments.")
 
         elif isinstance(error, DatabaseError):
             # General database errors
             logger.error(f"Database error in /{interaction.command.name}: {error}")
-            await interaction.response.send_message(
-                "⚠️ Database temporarily unavailable. Please try again in a moment.",
-                ephemeral=True
-            )
+            await _send_error(interaction, "⚠️ Database temporarily unavailable. Please try again in a moment.")
 
         elif isinstance(error, CharacterError):
             # Character-specific errors (already handled in commands, but catch here too)
             logger.warning(f"Character error in /{interaction.command.name}: {error}")
-            await interaction.response.send_message(
-                f"❌ {str(error)}",
-                ephemeral=True
-            )
+            await _send_error(interaction, f"❌ {str(error)}")
 
         elif isinstance(error, XPBotError):
             # Other custom errors
             logger.error(f"XP Bot error in /{interaction.command.name}: {error}")
-            await interaction.response.send_message(
-                f"❌ {str(error)}",
-                ephemeral=True
-            )
+            await _send_error(interaction, f"❌ {str(error)}")
 
         else:
             # Unexpected errors - log and show generic message
@@ -101,6 +91,8 @@ def setup_error_handlers(bot):
         """Handle errors from traditional prefix commands"""
         if isinstance(error, commands.CommandNotFound):
             return  # Silently ignore unknown commands
+        elif isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ Admin only.")
         else:
             logger.error(f"Error in !{ctx.command}: {error}", exc_info=True)
             raise error
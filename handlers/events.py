@@ -2,12 +2,55 @@
 Event handlers for XP Bot - handles on_ready and on_message
 """
 import os
+import json
+import hashlib
 import logging
 import discord
-from utils.xp import should_reset_xp, perform_daily_reset, get_level_and_progress
+from utils.xp import get_user_date, perform_daily_reset, get_level_and_progress
+from utils.users import get_or_fetch_user
+from ui.xp_request_view import XPRequestView
+from ui.character_view import DEFAULT_CHARACTER_IMAGE
 
 logger = logging.getLogger('xp-bot')
 
+# Activities in survival bot embed titles that can award prized species XP
+SURVIVAL_ACTIVITIES = ("fishing", "hunting", "foraging")
+
+# Reward markers in prized species field values and the XP each one is worth
+PRIZED_REWARDS = (
+    ("earned **100gp**", 100),
+    ("**+500gp**", 500),
+)
+
+
+# File storing the hash of the last synced slash command spec
+SYNC_HASH_FILE = os.getenv("SYNC_HASH_FILE", ".last_sync_hash")
+
+
+def _command_spec_hash(bot, scope: str) -> str:
+    """Hash the slash command payloads together with the sync target"""
+    spec = [cmd.to_dict(bot.tree) for cmd in bot.tree.get_commands()]
+    payload = json.dumps({"scope": scope, "commands": spec}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_sync_hash():
+    """Read the hash of the last successful sync, or None if there isn't one"""
+    try:
+        with open(SYNC_HASH_FILE) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_sync_hash(spec_hash: str):
+    """Persist the hash of a successful sync"""
+    try:
+        with open(SYNC_HASH_FILE, "w") as f:
+            f.write(spec_hash)
+    except OSError as e:
+        logger.warning(f"Could not write {SYNC_HASH_FILE}: {e}")
+
 
 def setup_events(bot, db, guild_id):
     """Register event handlers with the bot"""
@@ -23,12 +66,19 @@ def setup_events(bot, db, guild_id):
         env = os.getenv("ENV", "prod")
         guild_id_env = os.getenv("GUILD_ID")
 
-        if env == "dev" and guild_id_env:
+        # Skip the rate-limited sync round-trip when the command spec hasn't changed since last boot.
+        # FORCE_SYNC=1 syncs anyway, e.g. after commands were removed outside the bot
+        force_sync = os.getenv("FORCE_SYNC", "").lower() in ("1", "true", "yes")
+        spec_hash = _command_spec_hash(bot, f"{env}:{guild_id_env}")
+        if not force_sync and spec_hash == _read_sync_hash():
+            logger.info("Slash commands unchanged since last sync, skipping sync")
+        elif env == "dev" and guild_id_env:
             logger.info("Environment: development")
             guild = discord.Object(id=int(guild_id_env))
             bot.tree.copy_global_to(guild=guild)
             synced = await bot.tree.sync(guild=guild)
             logger.info(f"Synced {len(synced)} slash commands to dev guild {guild_id_env}")
+            _write_sync_hash(spec_hash)
         else:
             logger.info("Environment: production")
 
@@ -42,19 +92,32 @@ def setup_events(bot, db, guild_id):
             # Sync global commands
             synced = await bot.tree.sync()
             logger.info(f"Synced {len(synced)} global slash commands")
+            _write_sync_hash(spec_hash)
 
-        logger.info("Available slash commands:")
-        for cmd in bot.tree.get_commands():
-            logger.info(f"  /{cmd.name}")
+        logger.info("Available slash commands: " + ", ".join(f"/{cmd.name}" for cmd in bot.tree.get_commands()))
 
     @bot.event
     async def on_message(message):
         """Check each message to see if it should be awarded RP or Survival XP"""
+        # DMs and other guilds never award XP, so skip them without awaiting anything
+        if message.guild is None or (guild_id and message.guild.id != guild_id):
+            await bot.process_commands(message)
+            return
+
+        # Skip untracked channels using the cached channel sets before doing any other work
+        rp_channel_ids, survival_channel_ids = await db.get_tracked_channels(guild_id)
+        if message.author.bot:
+            tracked = not survival_channel_ids or message.channel.id in survival_channel_ids
+        else:
+            tracked = message.channel.id in rp_channel_ids
+        if not tracked:
+            await bot.process_commands(message)
+            return
+
         config = await db.get_config(guild_id)
 
         # Prized Species XP Request tracking (bot messages with prized rewards)
-        survival_channels = config.get("survival_channels", [])
-        if message.author.bot and message.embeds and (not survival_channels or message.channel.id in survival_channels):
+        if message.author.bot and message.embeds:
             embed = message.embeds[0]
 
             # Check for prized species awards
@@ -63,18 +126,15 @@ def setup_events(bot, db, guild_id):
             xp_amount = 0
             activity_type = None
 
-            # Extract character name from title
-            if embed.title:
-                title = embed.title
-                if " goes fishing" in title:
-                    char_name = title.split(" goes fishing")[0].strip()
-                    activity_type = "fishing"
-                elif " goes hunting" in title:
-                    char_name = title.split(" goes hunting")[0].strip()
-                    activity_type = "hunting"
-                elif " goes foraging" in title:
-                    char_name = title.split(" goes foraging")[0].strip()
-                    activity_type = "foraging"
+            # Extract character name from title ("<name> goes <activity>...")
+            # Most bot embeds are not survival activities, so bail out before touching fields
+            if embed.title and " goes " in embed.title:
+                name_part, _, activity_part = embed.title.partition(" goes ")
+                for activity in SURVIVAL_ACTIVITIES:
+                    if activity_part.startswith(activity):
+                        char_name = name_part.strip()
+                        activity_type = activity
+                        break
 
             # Check embed fields for prized species awards
             if char_name and activity_type:
@@ -87,11 +147,9 @@ def setup_events(bot, db, guild_id):
                         prized_detected = True
 
                         # Extract XP amounts from field value
-                        # Look for "earned **100gp**" or "**+500gp**"
-                        if "earned **100gp**" in field_value:
-                            xp_amount += 100
-                        if "**+500gp**" in field_value:
-                            xp_amount += 500
+                        for marker, amount in PRIZED_REWARDS:
+                            if marker in field_value:
+                                xp_amount += amount
 
                         logger.debug(f"Prized species detected: {char_name}, {activity_type}, {xp_amount} XP")
 
@@ -145,10 +203,6 @@ def setup_events(bot, db, guild_id):
                         return
 
                     # Create XP request
-                    from utils.xp import get_level_and_progress
-                    from ui.xp_request_view import XPRequestView
-                    from ui.character_view import DEFAULT_CHARACTER_IMAGE
-
                     char_name_actual = char_data['name']
                     xp_current = char_data['xp']
                     level, progress, required = get_level_and_progress(xp_current)
@@ -223,16 +277,20 @@ def setup_events(bot, db, guild_id):
                         pass
 
         # RP tracking (user messages)
-        elif not message.author.bot and message.channel.id in config.get("rp_channels", []):
+        elif not message.author.bot:
             user_id = message.author.id
-            await db.ensure_user(user_id)
 
-            # Check if we need to reset daily caps
-            if await should_reset_xp(db, user_id):
-                await perform_daily_reset(db, user_id)
+            # Ensure user and load timezone, last reset, and active character in one round-trip
+            rp_context = await db.fetch_rp_context(user_id)
+            active_char = rp_context['active_character']
+
+            # Check if we need to reset daily caps (date computed once from the message timestamp)
+            today_local = get_user_date(rp_context['timezone'], message.created_at)
+            if rp_context['last_xp_reset'] != today_local:
+                await perform_daily_reset(db, user_id, today_local)
+                if active_char:
+                    active_char = {**active_char, 'daily_xp': 0, 'char_buffer': 0}
 
-            # Get active character
-            active_char = await db.get_active_character(user_id)
             if not active_char:
                 return
 
@@ -248,15 +306,10 @@ def setup_events(bot, db, guild_id):
             # Update buffer remainder
             new_buffer = char_buffer % char_per_rp
 
-            # Award XP if any gained
-            if gained_xp > 0:
-                xp_result = await db.award_xp(
-                    user_id,
-                    active_char['name'],
-                    gained_xp,
-                    daily_xp_delta=gained_xp,
-                    char_buffer_delta=new_buffer - active_char['char_buffer']
-                )
+            # Award any XP gained and store the buffer remainder in one write
+            xp_gained = max(gained_xp, 0)
+            if xp_gained > 0 or new_buffer != active_char['char_buffer']:
+                xp_result = await db.apply_rp_delta(active_char['id'], xp_gained, new_buffer)
 
                 # Check for level-up and send notifications
                 if xp_result['leveled_up']:
@@ -265,15 +318,13 @@ def setup_events(bot, db, guild_id):
                     new_xp = xp_result['new_xp']
                     char_name = active_char['name']
 
-                    # Get updated character info
-                    updated_char = await db.get_character(user_id, char_name)
+                    updated_char = xp_result['character']
 
                     # Send level-up notification to log channel
                     log_channel_id = await db.get_log_channel()
                     if log_channel_id:
                         log_channel = bot.get_channel(log_channel_id)
                         if log_channel:
-                            from ui.character_view import DEFAULT_CHARACTER_IMAGE
                             level_embed = discord.Embed(
                                 title=f"🎉 Level Up! - {char_name}",
                                 description=f"**{char_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
@@ -331,10 +382,9 @@ def setup_events(bot, db, guild_id):
 
                     # Send DM to character owner
                     try:
-                        owner = await bot.fetch_user(user_id)
+                        owner = await get_or_fetch_user(bot, user_id)
 
                         # Create rich embed for level-up DM
-                        from ui.character_view import DEFAULT_CHARACTER_IMAGE
                         levelup_dm_embed = discord.Embed(
                             title=f"🎉 Level Up! - {char_name}",
                             description=f"**{char_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
@@ -394,8 +444,4 @@ def setup_events(bot, db, guild_id):
                     except Exception as e:
                         logger.warning(f"Could not send RP level-up DM to user {user_id}: {e}")
 
-            elif new_buffer != active_char['char_buffer']:
-                # Just update buffer
-                await db.update_character_buffer(user_id, active_char['name'], new_buffer)
-
         await bot.process_commands(message)
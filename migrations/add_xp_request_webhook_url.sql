@@ -0,0 +1,17 @@
+-- Migration: Add xp_request_webhook_url column to config table
+-- Run this migration on existing databases
+
+-- Add xp_request_webhook_url column if it doesn't exist
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'config'
+        AND column_name = 'xp_request_webhook_url'
+    ) THEN
+        ALTER TABLE config ADD COLUMN xp_request_webhook_url TEXT;
+        RAISE NOTICE 'Added xp_request_webhook_url column to config table';
+    ELSE
+        RAISE NOTICE 'xp_request_webhook_url column already exists';
+    END IF;
+END $$;
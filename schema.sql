@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS config (
     daily_rp_cap INTEGER DEFAULT 10,
     character_creation_roles BIGINT[] DEFAULT '{}',
     xp_request_channel BIGINT,
+    xp_request_webhook_url TEXT,
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
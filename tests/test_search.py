@@ -0,0 +1,21 @@
+"""
+Tests for character name matching
+"""
+from utils.search import closest_name
+
+
+NAMES = ("Aragorn", "Legolas", "Gimli")
+
+
+def test_closest_name_resolves_typos():
+    assert closest_name("Aragon", NAMES) == "Aragorn"
+    assert closest_name("legolsa", NAMES) == "Legolas"
+
+
+def test_closest_name_rejects_short_or_partial_queries():
+    for query in ("a", "ar", "ara", "arag", "gim", "olas"):
+        assert closest_name(query, NAMES) is None
+
+
+def test_closest_name_does_not_strip_punctuation():
+    assert closest_name("a.r.a.g.o.r.n", NAMES) is None
@@ -1,9 +1,10 @@
 """
 Character navigation view for XP Bot
 """
+import asyncio
 import discord
 import logging
-from utils.xp import get_level_and_progress
+from utils.xp import get_level_and_progress, format_progress
 
 logger = logging.getLogger('xp-bot')
 
@@ -45,16 +46,17 @@ class RetireConfirmationView(discord.ui.View):
                 view=self
             )
 
-            # Refresh the parent view by getting updated character list
-            updated_chars = await self.db.list_characters(self.user_id)
+            # Refresh the parent view with the updated character list and active character
+            updated_chars, active_char = await asyncio.gather(
+                self.db.list_characters(self.user_id),
+                self.db.get_active_character(self.user_id)
+            )
             if updated_chars:
                 # Update parent view with new character list
                 self.parent_view.characters = updated_chars
                 # Adjust index if needed
                 if self.parent_view.current_index >= len(updated_chars):
                     self.parent_view.current_index = len(updated_chars) - 1
-                # Get new active character
-                active_char = await self.db.get_active_character(self.user_id)
                 self.parent_view.active_char_name = active_char['name'] if active_char else None
                 self.parent_view._update_buttons()
             else:
@@ -166,9 +168,7 @@ class CharacterNavigationView(discord.ui.View):
 
         # Add Current Level Progress field
         if progress is not None:
-            percentage = int((progress / required) * 100)
-            bar = int((progress / required) * 20)
-            progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
+            progress_text = format_progress(progress, required)
             embed.add_field(
                 name="Current Level Progress",
                 value=progress_text,
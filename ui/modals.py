@@ -32,11 +32,7 @@ class XPSettingsModal(discord.ui.Modal, title="Configure RP Settings"):
                 await interaction.response.send_message(f"❌ Daily RP cap: {error_msg}", ephemeral=True)
                 return
 
-            await self.db.update_config(
-                self.guild_id,
-                char_per_rp=char_per_rp_val,
-                daily_rp_cap=daily_rp_cap_val
-            )
+            await self.db.update_rp_settings(self.guild_id, char_per_rp_val, daily_rp_cap_val)
             await interaction.response.send_message("✅ RP settings updated.", ephemeral=True)
         except ValueError:
             await interaction.response.send_message("❌ Please enter valid numbers.", ephemeral=True)
@@ -4,6 +4,7 @@ Quest confirmation and interaction views
 import logging
 import discord
 from datetime import date
+from utils.quest_xp import calculate_quest_xp
 
 logger = logging.getLogger('xp-bot')
 
@@ -50,7 +51,6 @@ class QuestEndConfirmView(discord.ui.View):
             monsters = await self.db.get_quest_monsters(self.quest_id)
 
             # Build summary message
-            from utils.quest_xp import calculate_quest_xp
 
             summary = f"✅ Quest **{self.quest_name}** completed!\n"
             summary += f"Start: {quest['start_date']} | End: {self.end_date}\n"
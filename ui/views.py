@@ -4,31 +4,55 @@ Discord UI views and dropdowns for XP Bot configuration
 import discord
 from ui.modals import XPSettingsModal, HFSettingsModal
 
+# Discord limit on options in a single select menu
+CHANNELS_PER_PAGE = 25
 
 class ChannelDropdown(discord.ui.Select):
     """Dropdown for selecting channels"""
 
-    def __init__(self, label, target_key, bot, db, guild_id):
+    def __init__(self, label, target_key, bot, db, guild_id, page: int = 0, configured_ids=frozenset()):
         self.target_key = target_key
         self.bot = bot
         self.db = db
         self.guild_id = guild_id
 
+        # Only list this guild's text channels (already filtered in discord.py's cache)
+        guild = bot.get_guild(guild_id)
+        channels = guild.text_channels if guild else []
+        self.page_count = max(1, -(-len(channels) // CHANNELS_PER_PAGE))
+
+        # Discord allows at most 25 options per select, so only send the current page
+        page_channels = channels[page * CHANNELS_PER_PAGE:(page + 1) * CHANNELS_PER_PAGE]
+        self.page_channel_ids = frozenset(ch.id for ch in page_channels)
         options = [
-            discord.SelectOption(label=ch.name, value=str(ch.id))
-            for ch in bot.get_all_channels() if isinstance(ch, discord.TextChannel)
+            discord.SelectOption(label=ch.name, value=str(ch.id), default=ch.id in configured_ids)
+            for ch in page_channels
         ]
+        disabled = False
+        if not options:
+            # Discord rejects empty selects; show a disabled placeholder instead
+            options = [discord.SelectOption(label="(no text channels)", value="0")]
+            disabled = True
+
+        placeholder = f"Select {label} channels..."
+        if self.page_count > 1:
+            placeholder = f"Select {label} channels (page {page + 1}/{self.page_count})..."
+
         super().__init__(
-            placeholder=f"Select {label} channels...",
+            placeholder=placeholder,
             min_values=0,
             max_values=min(25, len(options)),
-            options=options
+            options=options,
+            disabled=disabled
         )
 
     async def callback(self, interaction: discord.Interaction):
-        channel_ids = [int(v) for v in self.values]
+        # The selection only covers this page, so keep configured channels listed on other pages
+        config = await self.db.get_config(self.guild_id)
+        channel_ids = [cid for cid in config.get(self.target_key) or () if cid not in self.page_channel_ids]
+        channel_ids.extend(int(v) for v in self.values)
         if self.target_key == "rp_channels":
-            await self.db.update_config(self.guild_id, rp_channels=channel_ids)
+            await self.db.set_rp_channels(self.guild_id, channel_ids)
         elif self.target_key == "hf_channels":
             await self.db.update_config(self.guild_id, hf_channels=channel_ids)
         await interaction.response.send_message(f"✅ Updated `{self.target_key}`.", ephemeral=True)
@@ -37,20 +61,80 @@ class ChannelDropdown(discord.ui.Select):
 class ChannelSettingsView(discord.ui.View):
     """View for channel selection dropdowns"""
 
-    def __init__(self, bot, db, guild_id):
-        super().__init__(timeout=None)
-        self.add_item(ChannelDropdown("RP", "rp_channels", bot, db, guild_id))
-        self.add_item(ChannelDropdown("HF", "hf_channels", bot, db, guild_id))
+    def __init__(self, bot, db, guild_id, config, page: int = 0):
+        super().__init__(timeout=300)  # 5 minute timeout
+        self.bot = bot
+        self.db = db
+        self.guild_id = guild_id
+        self.page = page
+        # Message showing this view, so on_timeout can show the items disabled
+        self.message = None
+
+        rp_dropdown = ChannelDropdown(
+            "RP", "rp_channels", bot, db, guild_id, page, frozenset(config.get("rp_channels") or ())
+        )
+        self.add_item(rp_dropdown)
+        self.add_item(ChannelDropdown(
+            "HF", "hf_channels", bot, db, guild_id, page, frozenset(config.get("hf_channels") or ())
+        ))
+
+        # Update pagination button states
+        self.prev_button.disabled = (page == 0)
+        self.next_button.disabled = (page >= rp_dropdown.page_count - 1)
+
+    async def on_timeout(self):
+        """Called when view times out"""
+        for item in self.children:
+            item.disabled = True
+        # Otherwise the items still look live and clicking them fails with "interaction failed"
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+        self.stop()
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary, row=2)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the previous page of channels"""
+        config = await self.db.get_config(self.guild_id)
+        view = ChannelSettingsView(self.bot, self.db, self.guild_id, config, max(0, self.page - 1))
+        view.message = self.message
+        await interaction.response.edit_message(view=view)
+        self.stop()
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary, row=2)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the next page of channels"""
+        config = await self.db.get_config(self.guild_id)
+        view = ChannelSettingsView(self.bot, self.db, self.guild_id, config, self.page + 1)
+        view.message = self.message
+        await interaction.response.edit_message(view=view)
+        self.stop()
 
 
 class XPSettingsView(discord.ui.View):
     """Main settings view with buttons for different configuration options"""
 
     def __init__(self, bot, db, guild_id):
-        super().__init__(timeout=None)
+        super().__init__(timeout=300)  # 5 minute timeout
         self.bot = bot
         self.db = db
         self.guild_id = guild_id
+        # Message showing this view, so on_timeout can show the items disabled
+        self.message = None
+
+    async def on_timeout(self):
+        """Called when view times out"""
+        for item in self.children:
+            item.disabled = True
+        # Otherwise the items still look live and clicking them fails with "interaction failed"
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+        self.stop()
 
     @discord.ui.button(label="RP Settings", style=discord.ButtonStyle.primary)
     async def rp_settings_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -62,11 +146,14 @@ class XPSettingsView(discord.ui.View):
 
     @discord.ui.button(label="Channel Settings", style=discord.ButtonStyle.secondary)
     async def channel_settings_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        config = await self.db.get_config(self.guild_id)
+        view = ChannelSettingsView(self.bot, self.db, self.guild_id, config)
         await interaction.response.send_message(
             "Choose channels to enable XP tracking:",
-            view=ChannelSettingsView(self.bot, self.db, self.guild_id),
+            view=view,
             ephemeral=True
         )
+        view.message = await interaction.original_response()
 
     @discord.ui.button(label="Close", style=discord.ButtonStyle.danger)
     async def close_button(self, interaction: discord.Interaction, button: discord.ui.Button):
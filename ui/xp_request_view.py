@@ -3,6 +3,9 @@ XP Request approval view for XP Bot
 """
 import discord
 import logging
+from utils.xp import get_level_and_progress, format_progress
+from utils.users import get_or_fetch_user
+from ui.character_view import DEFAULT_CHARACTER_IMAGE
 
 logger = logging.getLogger('xp-bot')
 
@@ -35,7 +38,6 @@ class XPRequestView(discord.ui.View):
         await self.db.log_xp_grant(self.character_id, interaction.user.id, self.amount, f"Approved request: {self.memo}")
 
         # Get updated character info
-        from utils.xp import get_level_and_progress
         updated_char = await self.db.get_character(self.user_id, self.character_name)
         new_xp = updated_char['xp']
         new_level, progress, required = get_level_and_progress(new_xp)
@@ -51,7 +53,6 @@ class XPRequestView(discord.ui.View):
             if log_channel_id:
                 log_channel = interaction.client.get_channel(log_channel_id)
                 if log_channel:
-                    from ui.character_view import DEFAULT_CHARACTER_IMAGE
                     level_embed = discord.Embed(
                         title=f"🎉 Level Up! - {self.character_name}",
                         description=f"**{self.character_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
@@ -104,10 +105,9 @@ class XPRequestView(discord.ui.View):
 
             # Send DM to character owner
             try:
-                owner = await interaction.client.fetch_user(self.user_id)
+                owner = await get_or_fetch_user(interaction.client, self.user_id)
 
                 # Create rich embed for level-up DM
-                from ui.character_view import DEFAULT_CHARACTER_IMAGE
                 levelup_dm_embed = discord.Embed(
                     title=f"🎉 Level Up! - {self.character_name}",
                     description=f"**{self.character_name}** has leveled up from **Level {old_level}** to **Level {new_level}**!",
@@ -171,10 +171,9 @@ class XPRequestView(discord.ui.View):
         # Send XP grant notification to character owner (always sent, in addition to level-up if applicable)
         # This applies to both manual requests and auto-generated requests
         try:
-            owner = await interaction.client.fetch_user(self.user_id)
+            owner = await get_or_fetch_user(interaction.client, self.user_id)
 
             # Create DM embed matching the log channel format
-            from ui.character_view import DEFAULT_CHARACTER_IMAGE
             dm_embed = discord.Embed(
                 title=f"XP Granted - {self.character_name}",
                 color=discord.Color.green(),
@@ -206,9 +205,7 @@ class XPRequestView(discord.ui.View):
             )
 
             if progress is not None:
-                percentage = int((progress / required) * 100)
-                bar = int((progress / required) * 20)
-                progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
+                progress_text = format_progress(progress, required)
                 dm_embed.add_field(
                     name="**Current Level Progress**",
                     value=progress_text,
@@ -241,9 +238,7 @@ class XPRequestView(discord.ui.View):
 
         # Add progress bar
         if progress is not None:
-            percentage = int((progress / required) * 100)
-            bar = int((progress / required) * 20)
-            progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
+            progress_text = format_progress(progress, required)
             embed.add_field(
                 name="**New Level Progress**",
                 value=progress_text,
@@ -264,7 +259,6 @@ class XPRequestView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=self)
 
         # Post a notification to the channel about the approval
-        from ui.character_view import DEFAULT_CHARACTER_IMAGE
         notification_embed = discord.Embed(
             title=f"XP Granted - {self.character_name}",
             color=discord.Color.green(),
@@ -296,9 +290,7 @@ class XPRequestView(discord.ui.View):
         )
 
         if progress is not None:
-            percentage = int((progress / required) * 100)
-            bar = int((progress / required) * 20)
-            progress_text = f"`[{'█'*bar}{'-'*(20-bar)}]` {progress}/{required} ({percentage}%)"
+            progress_text = format_progress(progress, required)
             notification_embed.add_field(
                 name="**Current Level Progress**",
                 value=progress_text,
@@ -326,7 +318,7 @@ class XPRequestView(discord.ui.View):
         # Character owner already received a notification above
         if self.requester_id != self.user_id:
             try:
-                requester = await interaction.client.fetch_user(self.requester_id)
+                requester = await get_or_fetch_user(interaction.client, self.requester_id)
                 await requester.send(
                     f"✅ Your XP request for **{self.character_name}** has been approved!\n"
                     f"Amount: {self.amount:,} XP\n"
@@ -358,7 +350,7 @@ class XPRequestView(discord.ui.View):
 
         # Notify the requester
         try:
-            requester = await interaction.client.fetch_user(self.requester_id)
+            requester = await get_or_fetch_user(interaction.client, self.requester_id)
             await requester.send(
                 f"❌ Your XP request for **{self.character_name}** has been denied.\n"
                 f"Amount: {self.amount} XP\n"
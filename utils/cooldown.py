@@ -0,0 +1,33 @@
+"""
+Per-user slash command cooldowns backed by pycooldown
+"""
+from discord import app_commands
+from pycooldown import FixedCooldown
+
+
+def user_cooldown_key(interaction) -> int:
+    """Cooldown bucket key for app_commands.checks.cooldown: one bucket per user"""
+    return interaction.user.id
+
+
+def fixed_cooldown(rate: int, per: float):
+    """
+    Check that limits a command to `rate` uses per `per` seconds for each user.
+
+    Drop-in replacement for app_commands.checks.cooldown: buckets live in
+    pycooldown's compiled FixedCooldown, and a hit raises CommandOnCooldown so
+    the existing error handler formats the response.
+
+    Args:
+        rate: Number of uses allowed per period
+        per: Period length in seconds
+    """
+    cooldown = FixedCooldown(per, rate)
+
+    def predicate(interaction) -> bool:
+        retry_after = cooldown.update_ratelimit(interaction.user.id)
+        if retry_after is not None:
+            raise app_commands.CommandOnCooldown(app_commands.Cooldown(rate, per), retry_after)
+        return True
+
+    return app_commands.check(predicate)
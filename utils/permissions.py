@@ -1,8 +1,29 @@
 """
 Permission checking utilities for XP Bot
 """
+from functools import wraps
 
+ADMIN_ONLY_MSG = "❌ Admin only."
 
-def has_role(user, allowed_roles):
+
+def has_role(user, allowed_roles: frozenset) -> bool:
     """Return True if user has at least one allowed role name."""
-    return any(role.name in allowed_roles for role in getattr(user, 'roles', []))
+    # Plain users (e.g. in DMs) have no roles attribute
+    return not allowed_roles.isdisjoint(role.name for role in getattr(user, 'roles', ()))
+
+
+def has_any_role_id(user, allowed_role_ids: frozenset) -> bool:
+    """Return True if user has at least one allowed role ID."""
+    return not allowed_role_ids.isdisjoint(role.id for role in getattr(user, 'roles', ()))
+
+
+def admin_only(func):
+    """Decorator for slash command callbacks that rejects non-administrators.
+    Apply below @bot.tree.command so the wrapped signature is used for parameters."""
+    @wraps(func)
+    async def wrapper(interaction, *args, **kwargs):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(ADMIN_ONLY_MSG, ephemeral=True)
+            return
+        return await func(interaction, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,82 @@
+"""
+Character name matching for autocomplete
+"""
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Dict, List, Optional, Sequence, Set
+
+from rapidfuzz import fuzz, process
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+# Minimum fuzz.ratio score (0-100) for a typo to resolve to a character. The
+# result is written to, so this stays as strict as difflib's old 0.6 ratio or
+# stricter: a short or partial query must not land on a longer name.
+CLOSEST_NAME_CUTOFF = 80
+
+
+@lru_cache(maxsize=2048)
+def closest_name(query: str, names: tuple) -> Optional[str]:
+    """Return the character name closest to query, or None if nothing is similar enough
+    Memoized on (query, names), so a repeated misspelling against an unchanged list is free"""
+    match = process.extractOne(
+        query, names, scorer=fuzz.ratio, processor=str.casefold, score_cutoff=CLOSEST_NAME_CUTOFF
+    )
+    return match[0] if match else None
+
+
+class NameIndex:
+    """Case-insensitive search over one user's character names, casefolded once when built
+
+    A bigram -> name positions map narrows each query to the names that contain
+    every bigram of it, so only those are checked for a substring match. The
+    matches for the last query are kept too: autocomplete fires per keystroke,
+    and a query that extends the last one can only match a subset of its names.
+    """
+
+    __slots__ = ('names', '_folded', '_bigrams', '_last_query', '_last_matches')
+
+    def __init__(self, names: List[str]):
+        # Parallel sequences: position i of _folded is names[i] casefolded
+        self.names = names
+        self._folded = tuple(name.casefold() for name in names)
+        self._bigrams: Dict[str, Set[int]] = {}
+        for i, folded in enumerate(self._folded):
+            for j in range(len(folded) - 1):
+                self._bigrams.setdefault(folded[j:j + 2], set()).add(i)
+        self._last_query = ""
+        self._last_matches: Sequence[int] = ()
+
+    def _candidates(self, q: str) -> Sequence[int]:
+        """Positions of names that could contain q, in ascending order"""
+        if len(q) < 2:
+            return range(len(self.names))
+
+        postings = []
+        for j in range(len(q) - 1):
+            posting = self._bigrams.get(q[j:j + 2])
+            if not posting:
+                return []
+            postings.append(posting)
+
+        return sorted(set.intersection(*sorted(postings, key=len)))
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> List[str]:
+        """Names containing query, with names that start with it listed first"""
+        if not query:
+            return self.names[:limit]
+
+        q = query.casefold()
+        if self._last_query and q.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._candidates(q)
+
+        folded = self._folded
+        matches = [i for i in candidates if q in folded[i]]
+        self._last_query, self._last_matches = q, matches
+
+        prefix = (i for i in matches if folded[i].startswith(q))
+        substring = (i for i in matches if not folded[i].startswith(q))
+        return [self.names[i] for i in islice(chain(prefix, substring), limit)]
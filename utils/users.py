@@ -0,0 +1,32 @@
+"""
+Discord user lookup helpers for XP Bot
+"""
+import time
+from collections import OrderedDict
+
+# How long a user fetched over HTTP is reused before fetching again
+FETCHED_USER_TTL = 600.0
+FETCHED_USER_CACHE_SIZE = 256
+
+# user_id -> (expires_at, User) for users that weren't in the client's cache,
+# least recently used first
+_fetched_users = OrderedDict()
+
+
+async def get_or_fetch_user(client, user_id: int):
+    """Get a user from the client's cache, only hitting the Discord API on a miss"""
+    user = client.get_user(user_id)
+    if user is not None:
+        return user
+
+    cached = _fetched_users.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        _fetched_users.move_to_end(user_id)
+        return cached[1]
+
+    user = await client.fetch_user(user_id)
+    _fetched_users[user_id] = (time.monotonic() + FETCHED_USER_TTL, user)
+    _fetched_users.move_to_end(user_id)
+    if len(_fetched_users) > FETCHED_USER_CACHE_SIZE:
+        _fetched_users.popitem(last=False)
+    return user
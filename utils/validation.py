@@ -13,6 +13,17 @@ MAX_DAILY_CAP = 1000
 MIN_DAILY_CAP = 1
 MAX_CHAR_PER_RP = 10000
 MIN_CHAR_PER_RP = 1
+MAX_URL_LENGTH = 2000
+
+# Compiled once at import rather than on every validation call
+CHARACTER_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-\'\.]+$')
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
 
 def validate_character_name(name: str) -> tuple[bool, str]:
@@ -32,7 +43,7 @@ def validate_character_name(name: str) -> tuple[bool, str]:
         return False, f"Character name cannot exceed {MAX_CHARACTER_NAME_LENGTH} characters."
 
     # Check for valid characters (alphanumeric, spaces, basic punctuation)
-    if not re.match(r'^[a-zA-Z0-9\s\-\'\.]+$', name):
+    if not CHARACTER_NAME_PATTERN.match(name):
         return False, "Character name can only contain letters, numbers, spaces, hyphens, apostrophes, and periods."
 
     return True, ""
@@ -103,21 +114,13 @@ def validate_image_url(url: str) -> tuple[bool, str]:
     if not url:
         return True, ""  # Optional field
 
-    # Basic URL pattern
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    # Check length first so oversized input never reaches the regex
+    if len(url) > MAX_URL_LENGTH:
+        return False, f"URL is too long (max {MAX_URL_LENGTH} characters)."
 
-    if not url_pattern.match(url):
+    if not URL_PATTERN.match(url):
         return False, "Invalid URL format. Must start with http:// or https://"
 
-    if len(url) > 2000:
-        return False, "URL is too long (max 2000 characters)."
-
     return True, ""
 
 
@@ -129,19 +132,11 @@ def validate_character_sheet_url(url: str) -> tuple[bool, str]:
     if not url:
         return True, ""  # Optional field
 
-    # Use the same URL validation pattern
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    # Check length first so oversized input never reaches the regex
+    if len(url) > MAX_URL_LENGTH:
+        return False, f"URL is too long (max {MAX_URL_LENGTH} characters)."
 
-    if not url_pattern.match(url):
+    if not URL_PATTERN.match(url):
         return False, "Invalid URL format. Must start with http:// or https://"
 
-    if len(url) > 2000:
-        return False, "URL is too long (max 2000 characters)."
-
     return True, ""
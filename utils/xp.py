@@ -1,8 +1,10 @@
 """
 XP calculation and level progression utilities
 """
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import bisect
+import functools
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # XP/Level config
 LEVEL_THRESHOLDS = [
@@ -10,19 +12,16 @@ LEVEL_THRESHOLDS = [
     85000, 100000, 120000, 140000, 165000, 195000, 225000, 265000, 305000, 355000
 ]
 
+# Every possible 20-segment progress bar, indexed by filled segment count
+PROGRESS_BARS = tuple("█" * i + "-" * (20 - i) for i in range(21))
+
 
 def get_level_and_progress(xp):
     """Calculate level and progress from XP amount"""
-    level = 1
-    for i, threshold in enumerate(LEVEL_THRESHOLDS):
-        if xp < threshold:
-            level = i
-            break
-    else:
-        level = 20
+    level = bisect.bisect_right(LEVEL_THRESHOLDS, xp)
 
-    if level == 20:
-        return level, None, None
+    if level >= 20:
+        return 20, None, None
 
     current_threshold = LEVEL_THRESHOLDS[level - 1]
     next_threshold = LEVEL_THRESHOLDS[level]
@@ -31,29 +30,37 @@ def get_level_and_progress(xp):
     return level, progress, required
 
 
-async def should_reset_xp(db, user_id: int):
-    """Check if user needs daily XP reset"""
-    now_utc = datetime.utcnow()
-    tz = await db.get_user_timezone(user_id)
-    try:
-        user_time = now_utc.astimezone(ZoneInfo(tz))
-    except Exception:
-        user_time = now_utc
-    today_local = user_time.date()
+def format_progress(progress: int, required: int) -> str:
+    """Render level progress as a 20-segment bar with counts and percentage"""
+    if required <= 0:
+        return f"`[{PROGRESS_BARS[20]}]` {progress}/{required} (100%)"
+    percentage = int((progress / required) * 100)
+    bar = min(20, int((progress / required) * 20))
+    return f"`[{PROGRESS_BARS[bar]}]` {progress}/{required} ({percentage}%)"
 
-    last_reset = await db.get_last_xp_reset(user_id)
-    return last_reset != today_local
 
+@functools.lru_cache(maxsize=512)
+def _zi(name: str) -> ZoneInfo:
+    """Return a cached ZoneInfo for the given timezone name"""
+    return ZoneInfo(name)
 
-async def perform_daily_reset(db, user_id: int):
-    """Perform daily reset for a user"""
-    await db.reset_daily_caps(user_id)
 
-    now_utc = datetime.utcnow()
-    tz = await db.get_user_timezone(user_id)
+def _to_user_time(now_utc: datetime, tz: str) -> datetime:
+    """Convert a UTC datetime to the user's timezone, falling back to UTC if unknown"""
     try:
-        user_time = now_utc.astimezone(ZoneInfo(tz))
-    except Exception:
-        user_time = now_utc
+        return now_utc.astimezone(_zi(tz))
+    except (ZoneInfoNotFoundError, ValueError, OSError):
+        # OSError covers malformed keys such as ones naming a directory under the tz database
+        return now_utc
+
 
-    await db.update_last_xp_reset(user_id, user_time.date())
+def get_user_date(tz: str, now_utc: datetime = None) -> date:
+    """Get today's date in the user's timezone (now_utc must be timezone-aware if given)"""
+    if now_utc is None:
+        now_utc = datetime.now(timezone.utc)
+    return _to_user_time(now_utc, tz).date()
+
+
+async def perform_daily_reset(db, user_id: int, user_date: date):
+    """Perform daily reset for a user"""
+    await db.apply_daily_reset(user_id, user_date)